@@ -1,88 +1,214 @@
 import json
 import subprocess
+import tempfile
+import shutil
 import sys
+import os
 import re
 from pathlib import Path
 from datetime import date
 
 
+_conventional = re.compile(r'^([a-z]+)(\([^)]*\))?(!)?:\s*', re.I)
+_categories = ["Breaking Changes", "Features", "Bug Fixes", "Performance Improvements", "Others"]
+_chunk_size = 1 << 16
+_legacy_fragment = "legacy.md"  # CHANGELOG.md 切换到片段模式之前的内容
+_release_heading = re.compile(r'^## \[([^\]]+)\]')
+
+
 def run(cmd):
     return subprocess.run(cmd, shell=True, capture_output=True, text=True)
 
 
-def analyze_commits():
-    # 1. 寻找上一个 release 的 hash
-    # 注意：确保 grep 的字符串和你 commit_msg 的前缀完全一致
-    result = run("git log --grep='chore(release):' -n 1 --format=%H")
-    since = result.stdout.strip()
-    
-    # 2. 构建 git log 命令
-    # %s 是主题，%b 是正文，%h 是简短 hash
-    # 我们用一个极罕见的字符组合作为 commit 间的分隔符
-    format_str = "%s%n%b---ENDMSG---%h"
-    if since:
-        cmd = f"git log {since}..HEAD --format='{format_str}'"
-    else:
-        cmd = f"git log --format='{format_str}'"
+def git_log(args, cwd=None):
+    # 逐条读取 `git log -z` 的输出 (commit 之间以 NUL 分隔), 内存只保留当前 commit
+    # 每条记录为 "<short hash>\n<raw message>"
+    proc = subprocess.Popen(["git", "log", "-z", "--format=%h%n%B"] + args, cwd=cwd, stdout=subprocess.PIPE)
+    tail = b""
+    try:
+        while chunk := proc.stdout.read(_chunk_size):
+            records = (tail + chunk).split(b"\0")
+            tail = records.pop()
+            for record in records:
+                yield record.decode("utf-8", errors="replace").partition("\n")[::2]
+        if tail:
+            yield tail.decode("utf-8", errors="replace").partition("\n")[::2]
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+def classify(message):
+    # 返回 (level, category, 去掉前缀的标题), level: 3 breaking, 2 feat, 1 fix/perf, 0 其他
+    first_line = message.splitlines()[0]
+    match = _conventional.match(first_line)
+    clean_line = first_line[match.end():] if match else first_line
+    if match and match.group(1).islower() and match.group(3) or "BREAKING CHANGE" in message:
+        return 3, "Breaking Changes", clean_line
+    if match and not match.group(3):
+        if match.group(1) == "feat":
+            return 2, "Features", clean_line
+        if match.group(1) in {"fix", "perf"}:
+            return 1, "Bug Fixes" if match.group(1) == "fix" else "Performance Improvements", clean_line
+    return 0, "Others", clean_line
+
+
+def git(args, cwd=None):
+    return subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True)
+
 
-    result = run(cmd)
-    if not result.stdout.strip():
-        return 0, {}
+def load_state(state_path):
+    # 上次运行的结果: release (上一个 release 的 hash), head (已分析到的 commit), level, entries
+    if state_path is None or not Path(state_path).exists():
+        return None
+    try:
+        state = json.loads(Path(state_path).read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    if not isinstance(state, dict) or any(k not in state for k in ["release", "head", "level", "entries"]):
+        return None
+    return state
 
-    # 3. 解析
-    # 先按 commit 分隔
-    raw_blocks = result.stdout.strip().split("---ENDMSG---")
-    
+
+def save_state(state_path, state):
+    if state_path is not None:
+        Path(state_path).write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+def collect_commits(args, cwd=None, stop_at_release=False):
+    # 分类 git log 的 commit, 返回 (level, entries, 遇到的 release commit 的短 hash 或 None)
     level = 0
-    entries = {
-        "Breaking Changes": [],
-        "Features": [],
-        "Bug Fixes": [],
-        "Performance Improvements": [],
-        "Others": []
-    }
-
-    # raw_blocks 的结构现在是: [msg1, hash1\nmsg2, hash2...] 
-    # 需要精细化处理偏移
-    for i in range(len(raw_blocks) - 1):
-        # 当前块包含 msg
-        full_msg = raw_blocks[i].strip()
-        # 下一个块的开头包含当前 commit 的 hash
-        current_hash = raw_blocks[i+1].splitlines()[0].strip()
-        
+    entries = {category: [] for category in _categories}
+    for current_hash, full_msg in git_log(args, cwd=cwd):
+        full_msg = full_msg.strip()
+        if stop_at_release and "chore(release):" in full_msg:
+            return level, entries, current_hash
         if not full_msg or "[skip ci]" in full_msg:
             continue
 
-        first_line = full_msg.splitlines()[0]
-        clean_line = re.sub(r'^[a-z]+(\([^)]*\))?!?:\s*', '', first_line, flags=re.I)
-        
-        current_msg_level = 0
-        category = "Others"
-
-        # 判定
-        if "BREAKING CHANGE" in full_msg or re.match(r"^[a-z]+(\([^)]*\))?!:", first_line):
-            current_msg_level = 3
-            category = "Breaking Changes"
-        elif re.match(r"^feat(\([^)]*\))?:", first_line):
-            current_msg_level = 2
-            category = "Features"
-        elif re.match(r"^(fix|perf)(\([^)]*\))?:", first_line):
-            current_msg_level = 1
-            category = "Bug Fixes" if "fix" in first_line else "Performance Improvements"
-
+        current_msg_level, category, clean_line = classify(full_msg)
         level = max(level, current_msg_level)
         # 只在有意义的分类下添加，或者你想保留 Others
         entry = f"- {clean_line} ([#{current_hash}](https://github.com/zc0718/fcpp-semver/commit/{current_hash}))"
         entries[category].append(entry)
 
+    return level, entries, None
+
+
+def analyze_commits(cwd=None, state_path=None):
+    head = git(["rev-parse", "HEAD"], cwd=cwd).stdout.strip()
+    state = load_state(state_path)
+
+    # 1. 有缓存且历史未被改写 (缓存的 head 仍是 HEAD 的祖先) 时, 只分类新的 commit
+    result = None
+    if state and git(["merge-base", "--is-ancestor", state["head"], "HEAD"], cwd=cwd).returncode == 0:
+        level, entries, new_release = collect_commits([f"{state['head']}..HEAD"], cwd=cwd, stop_at_release=True)
+        if new_release is None:
+            entries = {category: entries[category] + state["entries"].get(category, []) for category in _categories}
+            result = state["release"], max(level, state["level"]), entries
+        else:  # 期间有新的 release, 从它重新分析
+            release = git(["rev-parse", new_release], cwd=cwd).stdout.strip()
+            result = (release, ) + collect_commits([f"{release}..HEAD"], cwd=cwd)[:2]
+
+    # 2. 没有可用的缓存: 寻找上一个 release 的 hash, 分析之后的全部 commit
+    # 注意：确保 grep 的字符串和你 commit_msg 的前缀完全一致
+    if result is None:
+        release = git(["log", "--grep=chore(release):", "-n", "1", "--format=%H"], cwd=cwd).stdout.strip()
+        result = (release, ) + collect_commits([f"{release}..HEAD"] if release else [], cwd=cwd)[:2]
+
+    release, level, entries = result
+    save_state(state_path, {"release": release, "head": head, "level": level, "entries": entries})
     return level, entries
 
 
+def release_notes(version, entries):
+    lines = [f"## [{version}] - {date.today().isoformat()}\n\n"]
+    for category, items in entries.items():
+        if items:
+            lines.extend([f"**{category}**\n", "\n".join(items), "\n\n"])
+    return "".join(lines)
+
+
+def write_changelog(changelog_path, head, parts):
+    # head 与 parts (已有的文件) 依次写入同目录的临时文件, 分块拷贝, 再原子替换 changelog
+    # 内存与 changelog 的大小无关, 中断时不会留下写了一半的 changelog
+    fd, tmp = tempfile.mkstemp(dir=changelog_path.parent, prefix=".CHANGELOG.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(head.encode("utf-8"))
+            for part in parts:
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, f, _chunk_size)
+        if changelog_path.exists():
+            shutil.copymode(changelog_path, tmp)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, changelog_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def prepend_changelog(changelog_path, notes):
+    write_changelog(changelog_path, notes, [changelog_path] if changelog_path.exists() else [])
+
+
+def write_fragment(fragments_dir, changelog_path, version, notes):
+    # 第一个片段写入前, 把已有的 CHANGELOG.md 保存为最旧的片段, 渲染时不会丢失
+    legacy = fragments_dir / _legacy_fragment
+    if changelog_path.exists() and not any(fragments_dir.glob("*.md")):
+        shutil.copyfile(changelog_path, legacy)
+    fragment = fragments_dir / f"{version}.md"
+    fragment.write_text(notes, encoding="utf-8")
+    return [fragment, legacy] if legacy.exists() else [fragment]
+
+
+def unrendered_entries(changelog_path, fragments):
+    # CHANGELOG.md 中没有对应片段的版本; 没有任何版本标题但有内容时, 整个文件都算
+    if not changelog_path.exists():
+        return []
+    versions, has_text = [], False
+    with open(changelog_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if match := _release_heading.match(line):
+                versions.append(match.group(1))
+            has_text = has_text or bool(line.strip())
+    if not versions:
+        return [changelog_path.name] if has_text else []
+    rendered = {_.stem for _ in fragments}
+    return [_ for _ in versions if _ not in rendered]
+
+
+def render_changelog(fragments_dir, changelog_path):
+    # 由 changelog/<version>.md 片段 (新版本在前, legacy.md 最后) 生成完整的 CHANGELOG.md
+    def version_key(fragment):
+        try:
+            return tuple(int(_) for _ in fragment.stem.split("."))
+        except ValueError:
+            return ()
+
+    fragments = sorted(fragments_dir.glob("*.md"), key=version_key, reverse=True) if fragments_dir.is_dir() else []
+    if not fragments:
+        print(f"Error: no changelog fragments in {fragments_dir}, {changelog_path.name} is left unchanged")
+        sys.exit(1)
+    if not (fragments_dir / _legacy_fragment).exists() and unrendered_entries(changelog_path, fragments):
+        print(f"Error: {changelog_path.name} would lose its entries, move it to {fragments_dir.name}/{_legacy_fragment} "
+              f"first")
+        sys.exit(1)
+    write_changelog(changelog_path, "", fragments)
+
+
 def main():
     script_dir = Path(__file__).parent
     root_dir = script_dir.parent.parent
     metadata_path = root_dir / "metadata.json"
     changelog_path = root_dir / "CHANGELOG.md"
+    state_path = root_dir / ".semver_state.json"  # 在 CI 中由 actions/cache 保留
+    fragments_dir = root_dir / "changelog"  # 存在时每个 release 只写一个片段, 不再改写 CHANGELOG.md
+
+    if "--render-changelog" in sys.argv[1:]:
+        render_changelog(fragments_dir, changelog_path)
+        return
 
     if not metadata_path.exists():
         print(f"Error: {metadata_path} not found")
@@ -93,7 +219,7 @@ def main():
     v_curr = metadata["version"]
     major, minor, patch = map(int, v_curr.split("."))
 
-    bump_level, log_entries = analyze_commits()
+    bump_level, log_entries = analyze_commits(state_path=state_path)
 
     if bump_level == 0:
         print("No relevant changes detected. Skipping release.")
@@ -114,19 +240,22 @@ def main():
         f.write("\n")
 
     if log_entries:
-        new_log = f"## [{new_version}] - {date.today().isoformat()}\n\n"
-        for category, items in log_entries.items():
-            if items:
-                new_log += f"**{category}**\n"
-                new_log += "\n".join(items) + "\n\n"
-        
-        content = changelog_path.read_text(encoding="utf-8") if changelog_path.exists() else ""
-        changelog_path.write_text(new_log + content, encoding="utf-8")
+        notes = release_notes(new_version, log_entries)
+        if fragments_dir.is_dir():
+            changed = write_fragment(fragments_dir, changelog_path, new_version, notes)
+        else:
+            prepend_changelog(changelog_path, notes)
+            changed = [changelog_path]
+    else:
+        changed = []
 
     run("git config user.name 'github-actions'")
     run("git config user.email 'github-actions@github.com'")
-    run(f"git add {metadata_path} {changelog_path}")
-    run(f'git commit -m "chore(release): {new_version} [skip ci]"')
+    run(f"git add {' '.join(str(_) for _ in [metadata_path] + changed)}")
+    if run(f'git commit -m "chore(release): {new_version} [skip ci]"').returncode == 0:
+        # release commit 之后没有待分析的 commit
+        release = git(["rev-parse", "HEAD"]).stdout.strip()
+        save_state(state_path, {"release": release, "head": release, "level": 0, "entries": {}})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+def median_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    names in results ({name: {'median': seconds, ...}}) whose median is slower than the one in baseline by more than
+    the threshold ratio, every compared name is printed; names missing in baseline are skipped
+    """
+    res = []
+    for k, v in results.items():
+        if (_ref := baseline.get(k)) is None:
+            continue
+        _ratio = v['median'] / _ref['median'] if _ref['median'] > 0 else 1.0
+        _status = 'REGRESSION' if _ratio > 1 + threshold else 'ok'
+        print(f"{k:<40} {_ref['median']:>10.4f}s -> {v['median']:>10.4f}s  x{_ratio:.2f}  {_status}")
+        if _status != 'ok':
+            res.append(k)
+    return res
@@ -0,0 +1,287 @@
+"""
+Benchmarks for the python hot paths of the recipe (conanfile.py), the docs builder (docs/build.py) and the
+versioning script (.github/scripts/commit_semver.py)
+
+run offline on a synthetic source tree, no conan, doxygen or sphinx binaries are required:
+    python ./benchmarks/hot_paths.py --headers 200 --objects 20 --languages 2 --versions 3 -o bench.json
+compare to the results of another commit, exit with 1 if any stage is slower than threshold:
+    python ./benchmarks/hot_paths.py --baseline bench.json --threshold 0.2
+the versioning stage analyzes a synthetic git history (git is required):
+    python ./benchmarks/hot_paths.py --stages semver --commits 100000
+"""
+from importlib import util as imp_util
+from pathlib import Path
+from typing import Callable
+import tracemalloc
+import subprocess
+import statistics
+import argparse
+import platform
+import tempfile
+import shutil
+import time
+import json
+import sys
+import os
+import re
+sep = os.path.sep
+_get_root_path_list = (lambda : (Path(__file__).__str__()).split(sep)[:-2])
+_lang_pool = ['en', 'zh', 'jp']
+sys.path.insert(0, sep.join(_get_root_path_list()))
+sys.path.insert(0, sep.join(_get_root_path_list() + ['benchmarks']))
+from baseline import median_regressions
+import file_index
+
+
+def _get_root_path() -> str:
+    return sep.join(_get_root_path_list())
+
+
+def _load_script(name: str, path: str):
+    # like conan does for recipes, the script folder is importable
+    if (_folder := os.path.dirname(path)) not in sys.path:
+        sys.path.insert(0, _folder)
+    spec = imp_util.spec_from_file_location(name, path)
+    module = imp_util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _git_revision() -> str:
+    _tmp = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_get_root_path(), capture_output=True,
+                          text=True)
+    return _tmp.stdout.strip() if _tmp.returncode == 0 else ''
+
+
+def _synthetic_languages(k: int) -> list[str]:
+    return (_lang_pool + [f'l{i}' for i in range(k)])[:k]
+
+
+def _synthetic_versions(k: int) -> list[str]:
+    return [f'{i + 1}.0' for i in range(k)]
+
+
+def _synthetic_object(i: int, j: int, langs: list[str], vers: list[str], cpp: bool) -> str:
+    _tag = '@attacher' if cpp and j % 3 == 0 else '@exporter'
+    _doc = ['/**\n']
+    _doc.extend([f' * @brief [{_l}] object {j} of unit {i} in {_l}\n' for _l in langs])
+    _doc.append(f' * @param a [{langs[0]}] the input\n')
+    _doc.append(f' * @since {vers[j % len(vers)]} \n')
+    _doc.extend([f' * {_tag}\n', ' */\n'])
+    if cpp:
+        _obj = [f'int unit{i}_obj{j}(int a) {{\n', f'    return a + {j};\n', '}\n']
+    else:
+        _obj = [f'int unit{i}_obj{j}(int a);\n']
+    return ''.join(_doc + _obj)
+
+
+def _synthetic_unit(i: int, m: int, langs: list[str], vers: list[str], suffix: str) -> str:
+    _imports = ['// Conan::ImportStart\n']
+    if suffix in {'hpp', 'h'}:
+        _imports.append('#pragma once\n')
+    else:
+        _imports.append(f'#include "unit{i}.{"hpp" if suffix == "cpp" else "h"}"\n')
+    _imports.extend(['#include <vector>\n', '#include <string>\n', '// Conan::ImportEnd\n'])
+    _file_doc = (f'/*!\n * @file unit{i}.{suffix}\n * @defgroup unit{i} unit{i}\n'
+                 f' * @brief [{langs[0]}] synthetic unit {i}\n * @since {vers[0]} \n */\n')
+    _objs = [_synthetic_object(i, j, langs, vers, suffix in {'cpp', 'c'}) for j in range(m)]
+    return '\n\n\n'.join([''.join(_imports), _file_doc] + _objs)
+
+
+def _synthetic_tree(root: str, n: int, m: int, langs: list[str], vers: list[str]):
+    # mirrors the conan cache layout: recipe in e/, sources exported to es/
+    for _f in ['e' + sep + 'include', 'e' + sep + 'src', 'es' + sep + 'include']:
+        os.makedirs(root + sep + _f, exist_ok=True)
+    for i in range(n):
+        for _folder, _suffix in [('include', 'hpp'), ('src', 'cpp'), ('include', 'h'), ('src', 'c')]:
+            with open(root + sep + 'e' + sep + _folder + sep + f'unit{i}.{_suffix}', 'w', encoding='utf-8') as f:
+                f.write(_synthetic_unit(i, m, langs, vers, _suffix))
+    _synthetic_c_headers(root, n, m, langs, vers)
+
+
+def _synthetic_c_headers(root: str, n: int, m: int, langs: list[str], vers: list[str]):
+    for i in range(n):
+        with open(root + sep + 'es' + sep + 'include' + sep + f'unit{i}.h', 'w', encoding='utf-8') as f:
+            f.write(_synthetic_unit(i, m, langs, vers, 'h'))
+
+
+def _synthetic_repo(root: str, n: int) -> str:
+    # n empty commits through git fast-import, the last release is the tenth of them
+    _repo, _kinds = root + sep + 'repo', ['feat(core): add {}', 'fix: repair {}', 'perf: speed up {}', 'docs: note {}',
+                                          'refactor!: rework {}', 'update {}\n\nBREAKING CHANGE: drop {}']
+    _stream = []
+    for i in range(1, n + 1):
+        _msg = 'chore(release): 0.1.0 [skip ci]' if i == n // 10 else _kinds[i % len(_kinds)].format(i, i)
+        _msg = _msg.encode('utf-8') + b'\n'
+        _stream.append(b'commit refs/heads/main\nmark :%d\ncommitter Bench <bench@example.com> %d +0000\n'
+                       b'data %d\n%s' % (i, 1700000000 + i, len(_msg), _msg))
+        if i > 1:
+            _stream.append(b'from :%d\n' % (i - 1))
+        _stream.append(b'\n')
+    subprocess.run(['git', 'init', '-q', _repo], check=True)
+    subprocess.run(['git', 'symbolic-ref', 'HEAD', 'refs/heads/main'], cwd=_repo, check=True)
+    subprocess.run(['git', 'fast-import', '--quiet'], cwd=_repo, input=b''.join(_stream), check=True)
+    return _repo
+
+
+def _synthetic_metadata(n: int) -> dict:
+    return {
+        'name': 'bench', 'version': '1.0.0', 'generate_modules_inplace': True, 'std_modules': ['vector'],
+        'user_modules': [], 'modules_workers': 0,
+        'dependencies': {
+            'common': {f'Common{i}': [f'Common{i}::Common{i}'] for i in range(n)},
+            'c': {f'C{i}': [f'c{i}::c{i}'] for i in range(n)},
+            'cpp': {f'Cpp{i}': [f'cpp{i}::cpp{i}'] for i in range(n)},
+            'test': {'GTest': ['gtest::gtest']}
+        }
+    }
+
+
+def _measure(func: Callable, repeat: int, setup: Callable = None) -> dict:
+    # timings without tracing, then one traced run for the peak of python allocations (in current process)
+    _seconds = []
+    for _ in range(repeat + 1):
+        if setup is not None:
+            setup()
+        if len(_seconds) < repeat:
+            _t = time.perf_counter()
+            func()
+            _seconds.append(time.perf_counter() - _t)
+        else:
+            tracemalloc.start()
+            func()
+            _peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return {'seconds': _seconds, 'min': min(_seconds), 'median': statistics.median(_seconds),
+            'peak_kib': round(_peak / 1024, 1)}
+
+
+def _recipe_benchmarks(root: str, args: argparse.Namespace, langs: list[str], vers: list[str]) -> dict:
+    recipe = _load_script('bench_conanfile', _get_root_path() + sep + 'conanfile.py')
+    _recipe = recipe.PackageRecipe(display_name='bench')
+    _recipe.recipe_folder = root + sep + 'e'
+    _recipe.folders.set_base_export_sources(root + sep + 'es')
+    _recipe.meta = _synthetic_metadata(args.objects)
+    _recipe.importable_modules = _recipe._determine_importable_modules()
+    _manifest = Path(_recipe.recipe_folder) / recipe._modules_manifest
+
+    _hpp_files = [str(_) for _ in Path(_recipe.recipe_folder, 'include').glob('*.hpp')]
+    _contents = [recipe._source_file_loader(_) for _ in _hpp_files]
+
+    def _module_elements():
+        for _x, _f in zip(_contents, _hpp_files):
+            recipe._module_elements(_x, Path(_f).stem, _recipe.importable_modules)
+
+    return {
+        'recipe._modules_preprocessing[cold]': _measure(_recipe._modules_preprocessing, args.repeat,
+                                                        setup=lambda: (_manifest.unlink(missing_ok=True),
+                                                                       file_index.invalidate())),
+        'recipe._modules_preprocessing[warm]': _measure(_recipe._modules_preprocessing, args.repeat),
+        'recipe._module_elements': _measure(_module_elements, args.repeat),
+        'recipe._make_c_compatible': _measure(_recipe._make_c_compatible, args.repeat,
+                                              setup=lambda: _synthetic_c_headers(root, args.headers, args.objects,
+                                                                                 langs, vers)),
+        'recipe._make_c_compatible[wrapped]': _measure(_recipe._make_c_compatible, args.repeat),
+        'recipe._preparing_deps_links[cold]': _measure(_recipe._preparing_deps_links, args.repeat,
+                                                       setup=lambda: _recipe.__dict__.pop('dependency_table', None)),
+        'recipe._preparing_deps_links[warm]': _measure(_recipe._preparing_deps_links, args.repeat),
+    }
+
+
+def _docs_benchmarks(root: str, args: argparse.Namespace, langs: list[str], vers: list[str]) -> dict:
+    docs = _load_script('bench_docs_build', _get_root_path() + sep + 'docs' + sep + 'build.py')
+    # language tags of the synthetic tree instead of the ones in root metadata.json
+    docs._hit_lang_tag = re.compile(rf"( \* @[a-z]+).*\[({'|'.join(langs)})] ")
+    _folders, _suffix = [root + sep + 'e' + sep + _ for _ in ['include', 'src']], ['h', 'c', 'hpp', 'cpp']
+    _files = docs._file_collector(_folders, _suffix)
+    _contents = []
+    for (k, v) in _files:
+        with open(k + sep + v, 'r', encoding='utf-8') as f:
+            _contents.append(f.readlines())
+    _filtered = [docs._language_filter(_x, langs)[langs[0]] for _x in _contents]
+
+    def _language_filter():
+        for _x in _contents:
+            docs._language_filter(_x, langs)
+
+    def _ver_filter():
+        for _x in _filtered:
+            for _ver in vers:
+                docs._ver_filter(_x, _ver)
+
+    return {
+        'docs._file_collector[cold]': _measure(lambda: docs._file_collector(_folders, _suffix), args.repeat,
+                                               setup=file_index.invalidate),
+        'docs._file_collector[warm]': _measure(lambda: docs._file_collector(_folders, _suffix), args.repeat),
+        'docs._language_filter': _measure(_language_filter, args.repeat),
+        'docs._ver_filter': _measure(_ver_filter, args.repeat),
+    }
+
+
+def _semver_benchmarks(root: str, args: argparse.Namespace) -> dict:
+    semver = _load_script('bench_commit_semver', sep.join([_get_root_path(), '.github', 'scripts',
+                                                           'commit_semver.py']))
+    _repo, _state = _synthetic_repo(root, args.commits), root + sep + 'semver_state.json'
+    _results = {'semver.analyze_commits': _measure(lambda: semver.analyze_commits(cwd=_repo), args.repeat)}
+    semver.analyze_commits(cwd=_repo, state_path=_state)  # re-runs without new commits only read the state
+    _results['semver.analyze_commits[cached]'] = _measure(lambda: semver.analyze_commits(cwd=_repo, state_path=_state),
+                                                          args.repeat)
+    return _results
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the python hot paths of recipe and docs builder')
+    parser.add_argument('--headers', type=int, default=100, help='number of header/source pairs (N)')
+    parser.add_argument('--objects', type=int, default=20, help='exported objects per file (M)')
+    parser.add_argument('--languages', type=int, default=2, help='number of documenting languages (K)')
+    parser.add_argument('--versions', type=int, default=2, help='number of documenting versions')
+    parser.add_argument('--commits', type=int, default=100000, help='commits of the synthetic git history')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions per stage')
+    parser.add_argument('--stages', choices=['all', 'recipe', 'docs', 'semver'], default='all')
+    parser.add_argument('-o', '--output', help='write results as json to this file (stdout if omitted)')
+    parser.add_argument('--baseline', help='results json of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='tolerated slowdown ratio to baseline')
+    parser.add_argument('--keep', action='store_true', help='keep the synthetic tree')
+    args = parser.parse_args(argv)
+
+    langs, vers = _synthetic_languages(max(args.languages, 1)), _synthetic_versions(max(args.versions, 1))
+    root = tempfile.mkdtemp(prefix='fcpp_bench_')
+    try:
+        _synthetic_tree(root, args.headers, args.objects, langs, vers)
+        stages = {}
+        if args.stages in {'all', 'recipe'}:
+            stages.update(_recipe_benchmarks(root, args, langs, vers))
+        if args.stages in {'all', 'docs'}:
+            stages.update(_docs_benchmarks(root, args, langs, vers))
+        if args.stages in {'all', 'semver'}:
+            stages.update(_semver_benchmarks(root, args))
+    finally:
+        if args.keep:
+            print(f'synthetic tree kept in {root}', file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    results = {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {k: getattr(args, k) for k in ['headers', 'objects', 'languages', 'versions', 'commits',
+                                                     'repeat']},
+        'stages': stages,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if median_regressions(results['stages'], baseline.get('stages', {}), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,12 @@
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, CMakeDeps, cmake_layout
-from typing import Literal
 from pathlib import Path
+from functools import cached_property
+from metadata_loader import load_metadata, dependency_links, merge_links
+from file_index import file_index, collect_files, invalidate
+import multiprocessing
+import hashlib
+import re
 import yaml
 import json
 import os
@@ -15,6 +20,15 @@ white_list = {f'<{_}>' for _ in ['algorithm', 'array', 'chrono', 'cmath', 'funct
                                  'thread', 'mutex', 'future', 'iostream', 'fstream', 'sstream', 'format', 'ranges',
                                  'mdspan', 'flat_map', 'flat_set']}
 _is_valid_import = (lambda x, c: x.startswith('#include ') and x[9:].strip() in c)
+_modules_generator_version = '3'  # bump when the generated module layout changes
+_modules_manifest = '.modules_manifest.json'
+_coverage_build_record = 'coverage_build_folder'  # in package res, path of the instrumented build
+_modules_graph = 'modules_graph.json'  # in src, import graph and build order of generated modules (artifact)
+_export_tags = ('@exporter', '@attacher')
+_c_guard_start = ['#ifdef __cplusplus\n', 'extern "C" {\n', '#endif\n']
+_c_guard_end = ['#ifdef __cplusplus\n', '}\n', '#endif\n']
+_hit_namespace_open = re.compile(r"^\s*(inline\s+)?namespace(\s+[\w:]+)?\s*\{\s*$")
+_hit_namespace_close = re.compile(r"^\s*}\s*(//.*)?$")
 conan_targets = {
     'Eigen3::Eigen': 'eigen::eigen',
     'ZLIB::ZLIB': 'zlib::zlib',
@@ -27,36 +41,75 @@ def _get_root_path() -> str:
 
 
 def _inherit_root_metadata():
-    with open(_get_root_path() + sep + 'metadata.json', 'r', encoding='utf-8') as f:
-        _meta = json.load(f)
-    return _meta
+    return load_metadata(_get_root_path() + sep + 'metadata.json')
 
 
 _metadata = _inherit_root_metadata()
 
 
-def _get_export_objects(x: list[str], tag: Literal['@exporter', '@attacher'] = '@exporter') -> list[str]:
-    _cache = (''.join(x)).split('\n\n')  # TODO: maybe \n*3 is better (consider the namespace in CPP)?
-    _export_objs = [_ for _ in _cache if tag in _]
-
-    container = []
-    for _obj in _export_objs:
-        _obj = [_ for _ in _obj.split('\n') if _ != '']
-        _res, _ptr = [_ for _ in _obj], False
-        for i, (_v1, _v2) in enumerate(zip(_obj, _res)):
-            if _v1.startswith(f' * {tag}'):
-                _ptr = True
-            if _v1.startswith(' */') and _ptr:
-                _res[i] = _v2 + '\nexport '
-                _ptr = False
-        _res = '\n'.join([_ for _ in _res if not _.startswith(f' * {tag}')])
-        if tag == '@exporter':
-            _res = _res.replace('export \n','export ')
-        else:  # @attacher
-            _res = _res.replace('export \n', '')
-        container.append(_res)
-
-    return container
+def _object_blocks(x: list[str]):
+    # stream global objects, separated by 2 blank lines at least (syntax guide 1.), so that a single blank line
+    # inside a namespace or function body does not cut the object
+    _block, _blanks = [], 0
+    for _l in x:
+        _l = _l.rstrip('\n')
+        if _l == '':
+            _blanks += 1
+            continue
+        if _blanks >= 2 and _block:
+            yield _block
+            _block = []
+        elif _blanks == 1 and _block:
+            _block.append('')
+        _block.append(_l)
+        _blanks = 0
+    if _block:
+        yield _block
+
+
+def _brace_balance(x: list[str]) -> int:
+    return sum(_l.count('{') - _l.count('}') for _l in x if not _l.lstrip().startswith(('*', '/*', '//')))
+
+
+def _tag_object(x: list[str], tag: str) -> list[str]:
+    # drop the tag line, and prefix 'export ' to the object following the docstring if exporter
+    _res, _ptr, _pending = [], False, False
+    for _l in x:
+        if _l.startswith(f' * {tag}'):
+            _ptr = True
+            continue
+        if _pending:
+            _l, _pending = 'export ' + _l if tag == '@exporter' else _l, False
+        if _l.startswith(' */') and _ptr:
+            _ptr, _pending = False, True
+        _res.append(_l)
+    return _res
+
+
+def _get_export_objects(x: list[str]) -> tuple[list[str], list[str]]:
+    # single pass for both exporter and attacher objects, which are re-wrapped by the namespaces they live in
+    exporters, attachers, _namespaces = [], [], []
+    for _block in _object_blocks(x):
+        _balance = _brace_balance(_block)
+        while _block and _namespaces and _balance < 0 and _hit_namespace_close.match(_block[0]):
+            _block.pop(0)
+            _namespaces.pop()
+            _balance += 1
+        while _block and _hit_namespace_open.match(_block[0]):
+            _namespaces.append(_block.pop(0).strip())
+            _balance -= 1
+        _scope = list(_namespaces)  # closing lines at the end still belong to current scope
+        while _block and _namespaces and _balance < 0 and _hit_namespace_close.match(_block[-1]):
+            _block.pop()
+            _namespaces.pop()
+            _balance += 1
+
+        for _tag, _container in zip(_export_tags, [exporters, attachers]):
+            if any(_tag in _l for _l in _block):
+                _obj = _scope + _tag_object(_block, _tag) + ['}' for _ in _scope]
+                _container.append('\n'.join(_obj))
+
+    return exporters, attachers
 
 
 def _source_file_loader(txt: str) -> list[str]:
@@ -65,12 +118,134 @@ def _source_file_loader(txt: str) -> list[str]:
     return _tmp
 
 
+def _pair_digest(*x: str) -> str:
+    # content hash of a header/source pair, as the key of one generated module
+    _h = hashlib.sha256()
+    for _f in x:
+        with open(_f, 'rb') as f:
+            _h.update(f.read())
+        _h.update(b'\0')
+    return _h.hexdigest()
+
+
 def _load_file(x: str) -> str:
     with open(x, 'r', encoding='utf-8') as f:
         res = f.readlines()
     return ''.join(res)
 
 
+def _module_elements(x: list[str], m_name: str, importable: list[str]):
+    # two transformations if matches:
+    # 1. #include <lib> => import <lib>;
+    # 2. #include "lib.hpp" => import "lib.hpp";
+
+    _flag, _is_import_lines, _splitter = 1, [], 0
+    for i, _l in enumerate(x):
+        _is_import_lines.append(_flag)
+        if _l.strip() == '// Conan::ImportEnd':
+            _flag = 0
+            _splitter = i + 1
+
+    _import_context = [l for i, l in zip(_is_import_lines, x) if i]
+    _other_context = [l for i, l in zip(_is_import_lines, x) if not i]
+
+    _tmp = ['// Conan::Escape ' + _ if _is_valid_import(_, importable) else _ for _ in _import_context[1:-1]]
+    _extra = ['import ' + _.split('#include ')[-1].strip() + ';\n' for _ in _tmp if
+              _.startswith('// Conan::Escape ')]
+    _intro, _split = ['module;\n', ], [f'export module {m_name};\n', ]
+
+    # drop '\n' in import lines
+    _intro, _tmp, _split, _extra = ([_.strip() for _ in _intro], [_.strip() for _ in _tmp],
+                                    [_.strip() for _ in _split], [_.strip() for _ in _extra])
+
+    _exporters, _attachers = _get_export_objects(_other_context)
+    return _intro, _tmp, _split, _extra, _exporters + _attachers
+
+
+def _module_content(hpp: str, cpp: str, m_name: str, importable: list[str]) -> str:
+
+    _hpp_content = _source_file_loader(hpp)
+    _hpp_intro, _hpp_inc, _hpp_split, _hpp_extra, _hpp_obj = _module_elements(_hpp_content, m_name, importable)
+
+    _cpp_content = _source_file_loader(cpp)
+    _cpp_intro, _cpp_inc, _cpp_split, _cpp_extra, _cpp_obj = _module_elements(_cpp_content, m_name, importable)
+
+    # merge export items in hpp or cpp, ordered (hpp first) to keep outputs reproducible
+    _m_intro, _m_split = _hpp_intro, _hpp_split  # follow the hpp nomenclature
+    _m_inc = [_ for _ in dict.fromkeys(_hpp_inc + _cpp_inc) if not _.startswith('// Conan::Escape')]
+    _m_inc = [_ for _ in _m_inc if not _.startswith('#pragma once')]
+    _m_inc = [_ for _ in _m_inc if f'{m_name}.hpp' not in _]  # escape self include
+    _m_extra = [_ for _ in dict.fromkeys(_hpp_extra + _cpp_extra) if f'"{m_name}.hpp"' not in _]
+    _m_obj = ['\n'] + '@@'.join(_hpp_obj + _cpp_obj).replace('@@', '\n\n\n').split('\n')
+
+    _m_full = _m_intro + _m_inc + _m_split + _m_extra + _m_obj
+    return '\n'.join(_m_full)
+
+
+def _pair_includes(importable: list[str], *x: str) -> list[str]:
+    # stems of quoted includes turned into imports (as _module_elements does) in the import blocks of a pair
+    res = []
+    for _f in x:
+        for _l in _source_file_loader(_f):
+            if _l.strip() == '// Conan::ImportEnd':
+                break
+            if _l.startswith('#include "') and _is_valid_import(_l, importable):
+                res.append(Path(_l[10:].split('"')[0]).stem)
+    return list(dict.fromkeys(res))
+
+
+def _module_levels(graph: dict[str, list[str]]) -> list[list[str]]:
+    # topological levels (Kahn), modules in one level only depend on previous levels and build in parallel
+    _pending = {k: set(v) for k, v in graph.items()}
+    res = []
+    while _pending:
+        _level = sorted([k for k, v in _pending.items() if not v])
+        if not _level:
+            raise ValueError(f'Cyclic module imports: {" -> ".join(_module_cycle(_pending))}')
+        for k in _level:
+            del _pending[k]
+        for v in _pending.values():
+            v.difference_update(_level)
+        res.append(_level)
+    return res
+
+
+def _module_cycle(graph: dict[str, set[str]]) -> list[str]:
+    # walk dependencies of unresolved modules until one repeats, every one of them has some
+    _path, _node = [], min(graph)
+    while _node not in _path:
+        _path.append(_node)
+        _node = min(graph[_node])
+    return _path[_path.index(_node):] + [_node]
+
+
+def _write_modules(tasks: list[tuple[str, str, str, str]], importable: list[str]):
+    # tasks in (hpp, cpp, module name, module file)
+    for (_hpp, _cpp, _m_name, _m_file) in tasks:
+        with open(_m_file, 'w', encoding='utf-8') as f:
+            f.write(_module_content(_hpp, _cpp, _m_name, importable))
+
+
+def _parallel_write_modules(tasks: list[tuple[str, str, str, str]], importable: list[str], workers: int) -> bool:
+    # fork-started workers inherit this (anonymously loaded) recipe module, nothing but the task lists is shared;
+    # return False if pairs were not (all) generated, the caller should fall back to serial generation
+    if workers < 2 or len(tasks) < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        return False
+    _ctx = multiprocessing.get_context('fork')
+    _procs = [_ctx.Process(target=_write_modules, args=(tasks[i::workers], importable))
+              for i in range(min(workers, len(tasks)))]
+    _started = True
+    try:
+        for _p in _procs:
+            _p.start()
+    except (OSError, ):  # e.g. resource limits on CI runners
+        _started = False
+    for _p in _procs:
+        if _p.pid is not None:
+            _p.join()
+    return _started and all(_p.exitcode == 0 for _p in _procs)
+
+
 def _pragma_in_import(x: list[str]) -> tuple[bool, int]:
     # return the pragma once line in conan import wrapper, as its index if exists (-1 if not)
     _has_pragma, _idx = False, -1
@@ -83,6 +258,24 @@ def _pragma_in_import(x: list[str]) -> tuple[bool, int]:
     return _has_pragma, _idx
 
 
+def _c_compatible_text(x: list[str]) -> list[str]:
+    # extern "C" wrapper of a C header, headers already wrapped (guards at both ends) are returned as they are
+    _has_pragma, _idx = _pragma_in_import(x)
+    _body = [l for i, l in enumerate(x) if i != _idx]
+    _stripped = [l.strip() for l in _body]
+    while _stripped and not _stripped[-1]:
+        _stripped.pop()
+    if _stripped[:3] == [_.strip() for _ in _c_guard_start] and _stripped[-3:] == [_.strip() for _ in _c_guard_end]:
+        return x
+    _start = ['#pragma once\n'] + _c_guard_start if _has_pragma else _c_guard_start
+    return _start + ['    ' + l for l in _body] + _c_guard_end
+
+
+def _component_requires(x: dict[str, list[str]]) -> list[str]:
+    # conan component requires of cmake targets, in link order
+    return list(dict.fromkeys([conan_targets.get(_t, _t) for _targets in x.values() for _t in _targets]))
+
+
 class PackageRecipe(ConanFile):
 
     package_type = "library"
@@ -94,87 +287,134 @@ class PackageRecipe(ConanFile):
 
     # Sources are located in the same place as this recipe, copy them to the recipe
     exports_sources = ["CMakeLists.txt", "src/*", "include/*", "metadata.json", "LICENSE"]
-    exports = ["conandata.yml", "metadata.json", "LICENSE"]
+    exports = ["conandata.yml", "metadata.json", "metadata_loader.py", "file_index.py", "LICENSE"]
 
     generators = "VirtualBuildEnv", "VirtualRunEnv"
-    conandata, meta, headers, sources, license_full_text , importable_modules = [None for _ in range(6)]
+    meta, headers, sources = [None for _ in range(3)]
 
     def init(self):
         """
         ps1: Get-Content "build" | Invoke-Expression
         bash: bash ./build
-        """
-        conandata_path = Path(self.recipe_folder) / "conandata.yml"
-        metadata_path = Path(self.recipe_folder) / "metadata.json"
-        license_path = Path(self.recipe_folder) / "LICENSE"
 
-        self.conandata = yaml.safe_load(conandata_path.read_text())
-        self.meta = yaml.safe_load(metadata_path.read_text())
+        called for every recipe instance (also graph only commands), keep it cheap: files are only read when
+        needed, modules are generated in export() or generate()
+        """
+        self.meta = load_metadata(str(Path(self.recipe_folder) / "metadata.json"))
 
         # Required attributes
         self.name, self.version = self.meta.get('name'), self.meta.get('version')
 
         # Optional attributes
-        self.license_full_text = _load_file(license_path.__str__())
         self.topics = tuple(self.meta.get('topics'))
         for k in ['license', 'url', 'homepage', 'description', 'authors', 'maintainers']:
             self.__setattr__(k, self.meta.get(k))
 
-        # Modules processing
-        self.headers, self.sources, self.importable_modules = None, None, self._determine_importable_modules()
+    @cached_property
+    def conandata(self) -> dict:
+        return yaml.safe_load((Path(self.recipe_folder) / "conandata.yml").read_text())
+
+    @cached_property
+    def license_full_text(self) -> str:
+        return _load_file(str(Path(self.recipe_folder) / "LICENSE"))
+
+    @cached_property
+    def importable_modules(self) -> list[str]:
+        return self._determine_importable_modules()
+
+    def export(self):
+        # modules processing, in place before exports_sources are copied (conan create/export)
         self._modules_preprocessing()
 
     def _file_detector(self, folder: str, obj: list[str], retarget: Path = None) -> list[tuple[str, str]]:
         entry = Path(self.recipe_folder) / folder if retarget is None else retarget / folder
-        res = []
-        for _obj in obj:
-            res.extend(list(entry.rglob(f"*.{_obj}")))
-        _tmp = [(os.path.dirname(str(file)), os.path.basename(str(file))) for file in res]
-        return _tmp
+        return collect_files([str(entry)], obj)
 
     def _modules_preprocessing(self):
 
-        # clear generated modules
-        _m_files = self._file_detector("src", ["ixx", "cppm", ])
-        for (k, v) in _m_files:
-            _rm_file = k + sep + v
-            if os.path.exists(_rm_file):
-                os.remove(_rm_file)
+        _root = Path(self.recipe_folder)
+        _suffix = 'ixx' if os.name == 'nt' else 'cppm'
+        _manifest = self._load_modules_manifest()
+        _settings = {'generator': _modules_generator_version, 'suffix': _suffix,
+                     'std_modules': self.meta.get('std_modules'), 'user_modules': self.meta.get('user_modules')}
+        _old_entries, _new_entries = _manifest.get('entries', {}), {}
+        _old_includes, _new_includes, _names = _manifest.get('includes', {}), {}, {}
+        _reusable = _old_entries if _manifest.get('settings') == _settings else {}
 
-        # regenerated module files
+        # regenerated module files, only for pairs whose contents changed
         if self.meta.get("generate_modules_inplace"):
 
             self.headers = self._file_detector("include", ["hpp", ])
             self.sources = self._file_detector("src", ["cpp", ])
-            _suffix = 'ixx' if os.name == 'nt' else 'cppm'
 
+            _tasks, _src_root = [], str(_root / 'src')
+            _hpp_index = file_index(str(_root / 'include')).get('hpp', {})
             for (k, v) in self.sources:
-                _src = v.split('.')
-                _mod_name = _src[0]
-
-                _hpp_content = _source_file_loader(k.replace('src', 'include') + sep + _mod_name + '.hpp')
-                _hpp_intro, _hpp_inc, _hpp_split, _hpp_extra, _hpp_obj = self._module_elements(_hpp_content,
-                                                                                               _mod_name)
-
-                _cpp_content = _source_file_loader(k + sep + v)
-                _cpp_intro, _cpp_inc, _cpp_split, _cpp_extra, _cpp_obj = self._module_elements(_cpp_content,
-                                                                                               _mod_name)
-
-                # merge export items in hpp or cpp
-                _m_intro, _m_split = _hpp_intro, _hpp_split  # follow the hpp nomenclature
-                _m_inc = [_ for _ in set(_hpp_inc).union(set(_cpp_inc)) if not _.startswith('// Conan::Escape')]
-                _m_inc = [_ for _ in _m_inc if not _.startswith('#pragma once')]
-                _m_inc = [_ for _ in _m_inc if f'{_mod_name}.hpp' not in _]  # escape self include
-                _m_extra = [_ for _ in set(_hpp_extra).union(set(_cpp_extra))]
-                _m_obj = ['\n'] + '@@'.join(_hpp_obj + _cpp_obj).replace('@@', '\n\n\n').split('\n')
+                _mod_name = v.split('.')[0]
+                _rel = os.path.relpath(k, _src_root)
+                if (_hpp_file := _hpp_index.get(_mod_name if _rel == '.' else _rel + sep + _mod_name)) is None:
+                    continue  # source without a header, nothing to export
+                _cpp_file = k + sep + v
+                _m_file = k + sep + _mod_name + f'.{_suffix}'
+
+                _key, _digest = Path(os.path.relpath(_m_file, _root)).as_posix(), _pair_digest(_hpp_file, _cpp_file)
+                _new_entries[_key], _names[_key] = _digest, _mod_name
+                _new_includes[_key] = (_old_includes[_key] if _reusable.get(_key) == _digest and _key in _old_includes
+                                       else _pair_includes(self.importable_modules, _hpp_file, _cpp_file))
+                if _reusable.get(_key) != _digest or not os.path.exists(_m_file):
+                    _tasks.append((_hpp_file, _cpp_file, _mod_name, _m_file))
+
+            _workers = self.meta.get('modules_workers') or os.cpu_count() or 1
+            if not _parallel_write_modules(_tasks, self.importable_modules, _workers):
+                _write_modules(_tasks, self.importable_modules)
+            invalidate(str(_root / 'src'))  # new module files, mtimes may be too coarse to notice
+
+        # clear stale modules: generated ones recorded in manifest, or all of them without a manifest
+        _m_files = self._file_detector("src", ["ixx", "cppm", ])
+        for (k, v) in _m_files:
+            _rm_file = k + sep + v
+            _key = Path(os.path.relpath(_rm_file, _root)).as_posix()
+            if _key not in _new_entries and (not _manifest or _key in _old_entries):
+                os.remove(_rm_file)
 
-                _m_full = _m_intro + _m_inc + _m_split + _m_extra + _m_obj
-                with open(k + sep + _mod_name + f'.{_suffix}', 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(_m_full))
+        self._dump_modules_graph(_names, _new_includes)
+        invalidate(str(_root / 'src'))  # pruned modules and the graph
+        self._dump_modules_manifest({'settings': _settings, 'entries': _new_entries, 'includes': _new_includes})
+
+    def _dump_modules_graph(self, names: dict[str, str], includes: dict[str, list[str]]):
+        # only rewritten on changes, cmake reconfigures when it does
+        _f = Path(self.recipe_folder) / 'src' / _modules_graph
+        if not names:
+            _f.unlink(missing_ok=True)
+            return
+        _modules = set(names.values())
+        _graph = {names[k]: [_ for _ in v if _ in _modules and _ != names[k]] for k, v in includes.items()}
+        _levels = _module_levels(_graph)
+        _content = json.dumps({
+            'modules': {names[k]: {'file': k.split('/', 1)[-1], 'imports': _graph[names[k]]}
+                        for k in sorted(names)},
+            'levels': _levels,
+            'order': [_ for _level in _levels for _ in _level],
+        }, indent=2)
+        if not _f.exists() or _f.read_text(encoding='utf-8') != _content:
+            _f.write_text(_content, encoding='utf-8')
+
+    def _load_modules_manifest(self) -> dict:
+        _f = Path(self.recipe_folder) / _modules_manifest
+        if not _f.exists():
+            return {}
+        try:
+            return json.loads(_f.read_text(encoding='utf-8'))
+        except (ValueError, ):  # broken manifest, regenerate everything and prune as without one
+            return {}
+
+    def _dump_modules_manifest(self, x: dict):
+        _f = Path(self.recipe_folder) / _modules_manifest
+        _f.write_text(json.dumps(x, indent=2, sort_keys=True), encoding='utf-8')
 
     def _determine_importable_modules(self):
-        _tmp = [f'<{_}>' for _ in self.meta.get('std_modules') if f'<{_}>' in white_list]
-        return _tmp + ['"' + _ + '.hpp";' for _ in self.meta.get("user_modules")]
+        _tmp = [f'<{_}>' for _ in self.meta.get('std_modules', []) if f'<{_}>' in white_list]
+        return _tmp + ['"' + _ + '.hpp"' for _ in self.meta.get('user_modules', [])]
 
     def build_requirements(self):
         self.build_requires(f"cmake/{self.meta.get('cmake_version')}")
@@ -193,23 +433,19 @@ class PackageRecipe(ConanFile):
             _build_std = "17" if _build_std not in {"17", "20", "23"} else _build_std  # fallback to C++17
             self.settings.compiler.cppstd = _build_std
 
+    def export_sources(self):
+        # wrap the exported copies once per export, sources in the project stay untouched
         self._make_c_compatible()
 
     def _make_c_compatible(self):
-        _c_hs = self._file_detector('include', ['h', ], retarget=Path(self.recipe_folder).parent / 'es')
+        _c_hs = self._file_detector('include', ['h', ], retarget=Path(self.export_sources_folder))
         for (k, v) in _c_hs:
             _f = k + sep + v
             with open(_f, 'r', encoding='utf-8') as f:
                 _org_text = f.readlines()
-            _has_pragma, _idx = _pragma_in_import(_org_text)
-            if _has_pragma:
-                _start = ['#pragma once\n', '#ifdef __cplusplus\n', 'extern "C" {\n', '#endif\n']
-            else:
-                _start = ['#ifdef __cplusplus\n', 'extern "C" {\n', '#endif\n']
-            _inner_text = ['    ' + l for i, l in enumerate(_org_text) if i != _idx]
-            _end = ['#ifdef __cplusplus\n', '}\n', '#endif\n']
-            _new_text = _start + _inner_text + _end
-
+            _new_text = _c_compatible_text(_org_text)
+            if _new_text == _org_text:  # already wrapped, keep the mtime for consumers
+                continue
             with open(_f, 'w', encoding='utf-8') as f:
                 f.write(''.join(_new_text))
 
@@ -221,20 +457,25 @@ class PackageRecipe(ConanFile):
         cmake_layout(self)
 
     def generate(self):
+        if os.path.normpath(self.source_folder) == os.path.normpath(self.recipe_folder):
+            self._modules_preprocessing()  # local flows (conan install/build .) are never exported
+
         tc = CMakeToolchain(self)
         tc.variables['C_DEPS'], tc.variables['CPP_DEPS'] = self._preparing_deps_links()
         tc.generate()
         deps = CMakeDeps(self)
         deps.generate()
 
+    @cached_property
+    def dependency_table(self) -> dict[str, dict[str, list[str]]]:
+        # computed once per recipe, test packages are linked to the cpp part
+        _links = dependency_links(self.meta)
+        return {'c': _links['c'], 'cpp': merge_links(_links['cpp'], _links['test'])}
+
     def _preparing_deps_links(self):
-        _common, _c, _cpp, _test = [self.meta.get('dependencies').get(_) for _ in ['common', 'c', 'cpp', 'test']]
-        _c = {k: v if k not in _common.keys() else list(set(v).union(set(_common.get(k)))) for k, v in _c.items()}
-        _cpp = {k: v if k not in _common.keys() else list(set(v).union(set(_common.get(k)))) for k, v in _cpp.items()}
-        _test_deps = [f"{k}@{' '.join(v)}" for k, v in _test.items()]
-        _c_deps = [f"{k}@{' '.join(v)}" for k, v in {**_common, **_c}.items()]
-        _cpp_deps = [f"{k}@{' '.join(v)}" for k, v in {**_common, **_cpp}.items()]
-        return _c_deps, list(set(_cpp_deps).union(set(_test_deps)))
+        # 'package@targets' items for CMake, in metadata order so that the configure cache is stable
+        _c, _cpp = self.dependency_table['c'], self.dependency_table['cpp']
+        return [f"{k}@{' '.join(v)}" for k, v in _c.items()], [f"{k}@{' '.join(v)}" for k, v in _cpp.items()]
 
     def build(self):
         cmake = CMake(self)
@@ -257,50 +498,22 @@ class PackageRecipe(ConanFile):
                 w.write(''.join([_ for _ in _file if not any([_.startswith(f' * {tag}') for tag in tags])]))
 
 
-    def _module_elements(self, x: list[str], m_name: str):
-        # two transformations if matches:
-        # 1. #include <lib> => import <lib>;
-        # 2. #include "lib.hpp" => import "lib.hpp";
-
-        _flag, _is_import_lines, _splitter = 1, [], 0
-        for i, _l in enumerate(x):
-            _is_import_lines.append(_flag)
-            if _l.strip() == '// Conan::ImportEnd':
-                _flag = 0
-                _splitter = i + 1
-
-        _import_context = [l for i, l in zip(_is_import_lines, x) if i]
-        _other_context = [l for i, l in zip(_is_import_lines, x) if not i]
-
-        _tmp = ['// Conan::Escape ' + _ if _is_valid_import(_, self.importable_modules) else _ for _
-                in _import_context[1:-1]]
-        _extra = ['import ' + _.split('#include ')[-1].strip() + ';\n' for _ in _tmp if
-                  _.startswith('// Conan::Escape ')]
-        _intro, _split = ['module;\n', ], [f'export module {m_name};\n', ]
-
-        # drop '\n' in import lines
-        _intro, _tmp, _split, _extra = ([_.strip() for _ in _intro], [_.strip() for _ in _tmp],
-                                        [_.strip() for _ in _split], [_.strip() for _ in _extra])
-
-        return (_intro, _tmp, _split, _extra, _get_export_objects(_other_context, '@exporter') +
-                _get_export_objects(_other_context, '@attacher'))
-
     def package(self):
         cmake = CMake(self)
         cmake.install()
+        if self.meta.get('activate_code_coverage'):  # counters stay in the build folder, for test_package
+            _f = Path(self.package_folder) / 'res' / _coverage_build_record
+            _f.parent.mkdir(parents=True, exist_ok=True)
+            _f.write_text(self.folders.base_build, encoding='utf-8')
 
     def package_info(self):
         self.cpp_info.libs = [self.name]
-        _c, _cpp = self._preparing_deps_links()
+        _c, _cpp = self.dependency_table['c'], self.dependency_table['cpp']
 
         self.cpp_info.components[f"{self.name}_c"].libs = [f"{self.name}_c"]
-        self.cpp_info.components[f"{self.name}_c"].requires = [[_t := _.split('@')[1],
-                                                                conan_targets[_t] if _t in conan_targets.keys()
-                                                                else _t][-1] for _ in _c]
+        self.cpp_info.components[f"{self.name}_c"].requires = _component_requires(_c)
         self.cpp_info.components[f"{self.name}_cpp"].libs = [f"{self.name}_cpp"]
-        self.cpp_info.components[f"{self.name}_cpp"].requires = [[_t := _.split('@')[1],
-                                                                  conan_targets[_t] if _t in conan_targets.keys()
-                                                                  else _t][-1] for _ in _cpp]
+        self.cpp_info.components[f"{self.name}_cpp"].requires = _component_requires(_cpp)
 
     @staticmethod
     def _call_syntax_suggestion():
@@ -314,13 +527,15 @@ class PackageRecipe(ConanFile):
         4.std_modules and user_modules in metadata.json affect import lines,
         5.std_modules make #include <stdlib> to import <stdlib>; in the right
           order, when 3. is satisfied;
-        6.user_modules make #include <usrlib.hpp> to import <usrlib.hpp> in
+        6.user_modules make #include "usrlib.hpp" to import "usrlib.hpp"; in
           the right order, when 3. is satisfied;
         7.multi-lined doxygen /** ... */ with @exporter inside, will export
           associated global object (see 1.) into generated modules;
         8.multi-lined doxygen /** ... */ with @attacher inside, will attach
           associated global object (see 1.) into generated modules;
         9.suffix .h and .c for C; then .hpp and .cpp for C++;
+        10.objects inside 'namespace ns {' ... '}' (separated as 1.) are
+          exported or attached within the same namespace;
         ============================= Guide Over =============================', 
         """
         print(*_content, sep='\n')
\ No newline at end of file
@@ -1,22 +1,30 @@
 from typing import TypeVar, Optional
 from pathlib import Path
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import os
 import json
 import shutil
 import re
 import subprocess
+import sys
+import hashlib
+import time
 sep = os.path.sep
 Language = TypeVar('Language')
 Version = TypeVar('Version')
 _get_root_path_list = (lambda : (Path(__file__).__str__()).split(sep)[:-2])
 _root_path_list = _get_root_path_list()
+sys.path.insert(0, sep.join(_root_path_list))
+from metadata_loader import load_metadata
+from file_index import collect_files as _file_collector, invalidate as _invalidate_index
 _pair_capture = {
     'h': 'c',
     'c': 'h',
     'hpp': 'cpp',
     'cpp': 'hpp'
 }
+_docs_cache = '.docs_cache.json'
 lang_tag_map = {
     'en': 'en',
     'zh': 'zh_CN',
@@ -29,16 +37,11 @@ def _get_root_path() -> str:
 
 
 def _inherit_root_metadata():
-    with open(_get_root_path() + sep + 'metadata.json', 'r', encoding='utf-8') as f:
-        _meta = json.load(f)
-    return _meta
+    return load_metadata(_get_root_path() + sep + 'metadata.json')
 
 
 _hit_com_tag = re.compile(r" \* @")
 _hit_lang_tag = re.compile(rf"( \* @[a-z]+).*\[({'|'.join(_inherit_root_metadata().get('doc_languages'))})] ")
-_hit_free_tag = re.compile(r" \* [^@]+")
-_hit_file_doc = re.compile(r"\n?/\*!(.|\n)*@file(.|\n)*@defgroup")
-_hit_since_command = re.compile(r"\n?/\*\*(.|\n)*@since ")
 language_map = {'en': 'English', 'zh': 'Chinese', 'jp': 'Japanese'}
 
 
@@ -48,105 +51,77 @@ def _no_recursive_clean_img(x: str):
             os.remove(x + sep + f)
 
 
-def _idx_slicer(x: np.ndarray) -> list[list[int]]:
-    res, _in_selection = [], False
-    for i, v in enumerate(x):
-        if not (v[0] == True and v[1] == True and v[2] == False):
-            if v[0] == True and v[1] == False and v[2] == False:
-                _in_selection = False
-            if _in_selection:
-                res[-1].append(i)
+def _language_filter(lines: list[str], langs: list[str]) -> dict[Language, list[str]]:
+    # single pass for all languages: a command tagged with [lang] opens a selection owned by lang, which goes on
+    # until the next command without tag; lines out of any selection are shared by all languages
+    containers, _owner = {k: [] for k in langs}, None
+    for l in lines:
+        if _hit_com_tag.match(l):
+            if (_match := _hit_lang_tag.match(l)) is not None:
+                _owner, _sp = _match.group(2), _match.end(2)
+                containers[_owner].append(l[:(_sp-4)] + l[_sp + 1:])
+                continue
+            _owner = None
+        if _owner is None:
+            for v in containers.values():
+                v.append(l)
         else:
-            res.append([i])
-            _in_selection = True
-    return res
+            containers[_owner].append(l)
+    return containers
 
 
-def _determine_sub_groups(x: list[list[int]], languages: list[str],
-                          _regex_ref: list[list[Optional[re.Match]]]) -> tuple[dict[str, list[int]], list[int]]:
-    res = {k: [] for k in languages}
-    for _set in x:
-        _match = _regex_ref[_set[0]][1]
-        res[_match.group(2)].extend(_set)
-    return res, [_[0] for _ in x]
+def _digest(x: str) -> str:
+    return hashlib.sha256(x.encode('utf-8')).hexdigest()
 
 
-def _language_filter(lines: list[str], langs: list[str], lang_tag: Language) -> list[str]:
-
-    container = []
-    _refs = [[_hit_com_tag.match(l), _hit_lang_tag.match(l), _hit_free_tag.match(l)] for l in lines]
-    _refs_bool = np.array([[j is not None for j in i] for i in _refs])
-    _idx_sets = _idx_slicer(_refs_bool)
-    _lang_involved_lines, _lang_tag_hit_line = _determine_sub_groups(_idx_sets, langs, _refs)
-    _all_lang_involved_lines = []
-
-    for k, v in _lang_involved_lines.items():
-        _all_lang_involved_lines.extend(v)
-
-    for i, l in enumerate(lines):
-        if i not in _all_lang_involved_lines:
-            container.append(l)
-        else:
-            if i in _lang_involved_lines[lang_tag]:
+def _prune_folder(root: str, keep: set[str]):
+    # remove files in root (non-recursive) which are not kept
+    for f in os.listdir(root):
+        if f not in keep and os.path.isfile(_f := root + sep + f):
+            os.remove(_f)
 
-                if i in _lang_tag_hit_line:
-                    _sp = _refs[i][1].regs[2][1]
-                    container.append(l[:(_sp-4)] + l[_sp + 1:])
-                else:
-                    container.append(l)
 
-    return container
+@lru_cache(maxsize=None)
+def _version_key(x: str) -> tuple[tuple[int, ...], int, tuple[tuple[int, int, str], ...]]:
+    # SemVer 2.0 precedence (e.g. 1.0.0-alpha < 1.0.0-alpha.1 < 1.0.0-rc.1 < 1.0.0), build metadata is ignored and
+    # missing minor or patch is 0; parsed once per distinct string in a build
+    _core, _, _pre = x.strip().lstrip('v').split('+', 1)[0].partition('-')
+    try:
+        _nums = [int(_) for _ in _core.split('.')]
+    except ValueError:
+        raise ValueError(f"Invalid version '{x.strip()}'") from None
+    _nums.extend([0 for _ in range(3 - len(_nums))])
+    _pre_ids = tuple((0, int(_), '') if _.isdigit() else (1, 0, _) for _ in _pre.split('.')) if _pre else ()
+    return tuple(_nums), 0 if _pre else 1, _pre_ids
 
 
-def _clean_doxygen_build(root: str):
-    for f in os.listdir(root):
-        full_path = root + sep + f
-        if os.path.isdir(full_path):
-            if f.startswith('_'):  # clean temporary folders
-                shutil.rmtree(full_path)
-            else:
-                _clean_doxygen_build(full_path)
-        elif f == 'Doxyfile.in':  # clean generated Doxyfile
-            os.remove(full_path)
+def _ver_should_include(x: str, ref_ver: str) -> bool:
+    return _version_key(x) <= _version_key(ref_ver)
 
 
-def _file_collector(folders: list[str], obj: list[str]) -> list[tuple[str, str]]:
-    res = []
-    for folder in folders:
-        entry = Path(folder)
-        for _obj in obj:
-            res.extend(list(entry.rglob(f"*.{_obj}")))
-    return [(os.path.dirname(str(file)), os.path.basename(str(file))) for file in res]
+def _is_file_doc(x: str) -> bool:
+    # /*! ... @file ... @defgroup ...
+    x = x[1:] if x.startswith('\n') else x
+    return x.startswith('/*!') and (_i := x.find('@file', 3)) >= 0 and x.find('@defgroup', _i + 5) >= 0
 
 
-def _ver_should_include(x: str, ref_ver: str) -> bool:
-    _x, _r = [int(_) for _ in x.split('.')], [int(_) for _ in ref_ver.split('.')]
-    while len(_x) < 3:
-        _x.append(0)
-    while len(_r) < 3:
-        _r.append(0)
-    res = True  # for all equal
-    for a, b in zip(_x, _r):
-        if a < b:
-            return True
-        elif a > b:
-            return False
-        else:  # equal
-            continue
-    return res
+def _is_since_doc(x: str) -> bool:
+    # /** ... @since ...
+    x = x[1:] if x.startswith('\n') else x
+    return x.startswith('/**') and x.find('@since ', 3) >= 0
 
 
 def _ver_filter(x: list[str], ver: str) -> tuple[list[str], str]:
     x = (''.join(x)).split('\n\n\n')
     container, _need_append_end, file_ver = [], False, ''
     for i, block in enumerate(x):  # x[0] for import declaration
-        if _hit_file_doc.match(block):
+        if _is_file_doc(block):
             if '@since ' in block:
                 file_ver = block.split('@since ')[1].split(' ')[0].strip()
             container.append(block+'\n//! @{')
             _need_append_end = True
-        elif _match := _hit_since_command.match(block):
-            _obj_ver = block[_match.regs[1][0]:].split('@since ')[1].split(' ')[0]  # version getter
+        elif _is_since_doc(block):
+            _obj_ver = block.rsplit('@since ', 1)[1].split(' ')[0]  # version getter, of the last @since
             if _ver_should_include(_obj_ver, ver):
                 container.append(block)
         else:
@@ -163,7 +138,7 @@ def _generate_docs_index(languages: list[str], versions: list[str], lib: str) ->
     }
 
     version_groups = ""
-    for version in sorted(versions, reverse=True):
+    for version in sorted(versions, key=_version_key, reverse=True):
         group = f'    <!-- 版本 {version} -->\n'
         group += f'    <div class="version-group">\n'
         group += f'      <h2 class="version-title">Version {version}</h2>\n'
@@ -271,6 +246,32 @@ def _generate_docs_index(languages: list[str], versions: list[str], lib: str) ->
     return html_content
 
 
+def _run_logged(cmd: list[str], cwd: str, log: str) -> tuple[int, float]:
+    # run cmd with its outputs in log, return the exit code (-1 if cmd can not start) and wall time
+    _t = time.perf_counter()
+    with open(log, 'w', encoding='utf-8') as f:
+        try:
+            _code = subprocess.run(cmd, cwd=cwd, stdout=f, stderr=subprocess.STDOUT).returncode
+        except (OSError, ) as err:
+            f.write(f'{err}\n')
+            _code = -1
+    return _code, time.perf_counter() - _t
+
+
+def _run_jobs(jobs: dict[str, tuple[list[str], str, str]], workers: Optional[int], title: str) -> dict[str, str]:
+    # jobs in {label: (cmd, cwd, log)}, run by at most workers (all cores if 0 or None) at a time; return failures
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max(min(workers or os.cpu_count() or 1, len(jobs)), 1)) as pool:
+        _futures = {pool.submit(_run_logged, *v): k for k, v in jobs.items()}
+        for i, _future in enumerate(as_completed(_futures)):
+            _label, (_code, _seconds) = _futures[_future], _future.result()
+            _status = 'successfully generated' if _code == 0 else 'failed'
+            print(f"{title}: Documentation of {_label} {_status} ({i + 1}/{len(jobs)}, {_seconds:.1f}s)")
+            if _code != 0:
+                failures[_label] = f"{_label} exit code {_code}, see {jobs[_label][2]}"
+    return failures
+
+
 def _capture_escape_files(x: list[str]) -> list[str]:
     _tmp = [_.split('.') for _ in x]
     _suffix = [_pair_capture.get(_[1]) for _ in _tmp]
@@ -286,6 +287,8 @@ class AutomationDoc:
     _images_doxygen_destination = sep.join(_root_path_list + ['docs', 'doxygen', 'images'])
     _images_sphinx_destination = sep.join(_root_path_list + ['docs', 'sphinx', 'images'])
 
+    _cache, _job_inputs = None, None
+
     def __init__(self):
         self.meta = _inherit_root_metadata()
         self._copy_images_for_doxygen_and_sphinx()
@@ -293,16 +296,17 @@ class AutomationDoc:
         self.sphinx_automation()
 
     def doxygen_automation(self):
-        self._doxygen_scripts_from_sources_to_langs()
-        self._doxygen_scripts_from_langs_to_vers()
+        os.makedirs(self._doxygen_root + sep + 'build', exist_ok=True)
+        self._load_cache()
+        self._doxygen_scripts_from_sources_to_vers()
         self._doxygen_config_injection()
         self._doxygen_config_execution()
         self._doxygen_export_navigation()
         self._doxygen_build_clean()
+        self._dump_cache()
 
     def sphinx_automation(self):
         _path = sep.join(_root_path_list + ['docs', 'sphinx'])
-        subprocess.run(["make", "-C", _path, "clean"])
         subprocess.run(["make", "-C", _path, "gettext"])
         _cmd = ["sphinx-intl", "update", "-p", _path + sep + "build" + sep + "gettext", "-d", _path + sep + "locales"]
         for _ in self.meta.get('doc_languages'):
@@ -310,11 +314,17 @@ class AutomationDoc:
                 _cmd.append('-l')
                 _cmd.append(lang_tag_map[_])
         subprocess.run(_cmd)
+
+        # each language in its own build/<lang>/ folder, built concurrently with parallel reading; the folders are
+        # kept between runs, so their environment pickles are reused (not across languages, where they differ)
+        _jobs = {}
         for _ in self.meta.get('doc_languages'):
-            if _ != 'en':
-                subprocess.run(["make", "-C", _path, "-e", f"SPHINXOPTS=-D language={lang_tag_map[_]}", "html"])
-        subprocess.run(["make", "-C", _path, "clean"])
-        subprocess.run(["make", "-C", _path, "html"])
+            _cmd = ["make", "-C", _path, "html", f"BUILDDIR=build/{lang_tag_map[_]}",
+                    f"SPHINXOPTS=-j auto -D language={lang_tag_map[_]}"]
+            _jobs[f'[{_}]'] = (_cmd, _path, _path + sep + 'build' + sep + f'sphinx_{lang_tag_map[_]}.log')
+        os.makedirs(_path + sep + 'build', exist_ok=True)
+        if failures := _run_jobs(_jobs, self.meta.get('doc_jobs'), 'Sphinx build system'):
+            raise RuntimeError('Sphinx build system: failed jobs\n' + '\n'.join(failures.values()))
 
     def _copy_images_for_doxygen_and_sphinx(self):
         # # customize prefix syntax here
@@ -335,71 +345,54 @@ class AutomationDoc:
                 shutil.copy2(_f, self._images_doxygen_destination + sep + img)
                 shutil.copy2(_f, self._images_sphinx_destination + sep + img)
 
-    def _doxygen_scripts_from_sources_to_langs(self):
-
-        # remove if exists
-        _build_folder = self._doxygen_root + sep + 'build'
-        if 'build' in os.listdir(self._doxygen_root):
-            for _f in os.listdir(_build_folder):  # clean build folder (save isolated files for sub-git)
-                _tmp = _build_folder + sep + _f
-                if os.path.isdir(_tmp):
-                    shutil.rmtree(_tmp)
-        else:  # make folders
-            os.mkdir(_build_folder)
-
-        for _lang in self.meta.get('doc_languages'):
-            _lang_folder = _build_folder + sep + _lang
-            os.mkdir(_lang_folder)
-            os.mkdir(_lang_folder + sep + f'_{_lang}_docstrings')
-            for _ver in self.meta.get('doc_versions'):
-                os.mkdir(_lang_folder + sep + f'v{_ver}')
-
-        # move filtered docstring files
+    def _doxygen_scripts_from_sources_to_vers(self):
+
+        # make folders if not exist, the build folder is kept as cache of incremental builds
+        _build_folder, _langs, _vers = self._doxygen_root + sep + 'build', self.meta.get('doc_languages'), \
+            self.meta.get('doc_versions')
+        _debug = self.meta.get('doc_debug_intermediates')
+        for _lang in _langs:
+            if _debug:  # language filtered files, for debugging only
+                os.makedirs(_build_folder + sep + _lang + sep + f'_{_lang}_docstrings', exist_ok=True)
+            elif os.path.isdir(_f := _build_folder + sep + _lang + sep + f'_{_lang}_docstrings'):
+                shutil.rmtree(_f)
+            for _ver in _vers:
+                os.makedirs(_build_folder + sep + _lang + sep + f'v{_ver}' + sep + f'_{_lang}_v{_ver}_docstrings',
+                            exist_ok=True)
+
+        # read every source once, filtered by language then version in memory, each final input is written as soon
+        # as it is filtered, so only file names and hashes are kept
         _files = _file_collector([self._root + sep + _ for _ in self.meta.get('doc_doxygen_folders')],
                                  self.meta.get('doc_doxygen_suffix'))
+        _inputs = {(_lang, _ver): {} for _lang in _langs for _ver in _vers}
+        should_be_escape = {(_lang, _ver): set() for _lang in _langs for _ver in _vers}
         for (k, v) in _files:
-            _f = k + sep + v
-            with open(_f, 'r', encoding='utf-8') as f:
+            with open(k + sep + v, 'r', encoding='utf-8') as f:
                 _tmp = f.readlines()
-            for _lang in self.meta.get('doc_languages'):
-                _tmp_filtered = _language_filter(_tmp, self.meta.get('doc_languages'), _lang)
-
-                with open(_build_folder + sep + _lang + sep + f'_{_lang}_docstrings' + sep + v,
-                          'w', encoding='utf-8') as f:
-                    f.write(''.join(_tmp_filtered))
-
-    def _doxygen_scripts_from_langs_to_vers(self):
-
-        _build_folder = self._doxygen_root + sep + 'build'
-        for _lang in self.meta.get('doc_languages'):
-            _f_out = _build_folder + sep + _lang
-            for _ver in self.meta.get('doc_versions'):
-                _f_in = _f_out + sep + f'v{_ver}'
-                _docstrings = f'_{_lang}_v{_ver}_docstrings'
-
-                if _docstrings in os.listdir(_f_in):  # remove if exists
-                    shutil.rmtree(_docstrings)
-
-                _f_final = _f_in + sep + _docstrings
-                os.mkdir(_f_final)
-
-                should_be_escape = []
-                for file in os.listdir(_r := _f_out + sep + f'_{_lang}_docstrings'):
-                    with open(_r + sep + file, 'r', encoding='utf-8') as f:
-                        _tmp = f.readlines()
-
-                    _tmp, _file_ver = _ver_filter(_tmp, _ver)
-                    if _file_ver:
-                        if not _ver_should_include(_file_ver, _ver):
-                            should_be_escape.append(file)
-
-                    with open(_f_final + sep + file, 'w', encoding='utf-8') as f:
-                        f.write('\n\n\n'.join(_tmp))
-
-                _escape_files = _capture_escape_files(should_be_escape)  # remove unmatched version files
-                for file in os.listdir(_r := _f_out + sep + f'_{_lang}_docstrings'):
-                    if file in _escape_files:
-                        os.remove(_f_final + sep + file)
+            for _lang, _tmp_filtered in _language_filter(_tmp, _langs).items():
+                if _debug:
+                    self._write_if_changed(_build_folder + sep + _lang + sep + f'_{_lang}_docstrings' + sep + v,
+                                           ''.join(_tmp_filtered))
+                for _ver in _vers:
+                    _tmp_ver, _file_ver = _ver_filter(_tmp_filtered, _ver)
+                    if _file_ver and not _ver_should_include(_file_ver, _ver):
+                        should_be_escape[(_lang, _ver)].update(_capture_escape_files([v]))  # with its pair
+                    if v in should_be_escape[(_lang, _ver)]:
+                        continue
+                    _f_final = _build_folder + sep + _lang + sep + f'v{_ver}' + sep + f'_{_lang}_v{_ver}_docstrings'
+                    _inputs[(_lang, _ver)][v] = self._write_if_changed(_f_final + sep + v, '\n\n\n'.join(_tmp_ver))
+
+        # drop unmatched version files, also partners written before the file escaping them was read
+        for (_lang, _ver), _files_ver in _inputs.items():
+            _f_final = _build_folder + sep + _lang + sep + f'v{_ver}' + sep + f'_{_lang}_v{_ver}_docstrings'
+            _files_ver = {k: v for k, v in _files_ver.items() if k not in should_be_escape[(_lang, _ver)]}
+            _prune_folder(_f_final, set(_files_ver.keys()))
+            self._job_inputs[f'{_lang}/v{_ver}'] = _files_ver
+        if _debug:
+            for _lang in _langs:
+                _prune_folder(_build_folder + sep + _lang + sep + f'_{_lang}_docstrings', {v for (k, v) in _files})
+        for _ in self.meta.get('doc_doxygen_folders'):  # inputs written above may live in a collected folder
+            _invalidate_index(self._root + sep + _)
 
     def _doxygen_config_injection(self):
 
@@ -411,6 +404,9 @@ class AutomationDoc:
                                             ' '.join([f'*.{_}' for _ in self.meta.get('doc_doxygen_suffix')]))
         _meta_config = _meta_config.replace("%GRAPHVIZ_BIN%", self.meta.get('graphviz_bin'))
 
+        _images = _digest(json.dumps([[_, os.stat(self._images_doxygen_destination + sep + _).st_mtime_ns]
+                                      for _ in sorted(os.listdir(self._images_doxygen_destination))]))
+
         _build_folder = self._doxygen_root + sep + 'build'
         for _lang in self.meta.get('doc_languages'):
             _f_out = _build_folder + sep + _lang
@@ -420,26 +416,78 @@ class AutomationDoc:
                 _meta = _meta.replace("%VER%", _ver)
                 _meta = _meta.replace("%FULL_LAN%", language_map.get(_lang))
 
-                with open(_f_in + sep + 'Doxyfile.in', 'w', encoding='utf-8') as f:
-                    f.write(_meta)
+                _inputs = self._job_inputs.setdefault(f'{_lang}/v{_ver}', {})
+                _inputs['Doxyfile.in'] = self._write_if_changed(_f_in + sep + 'Doxyfile.in', _meta)
+                _inputs['images'] = _images
 
     def _doxygen_config_execution(self):
 
+        # rerun only jobs whose inputs (docstring files and Doxyfile.in) changed, or whose outputs are missing
         _build_folder = self._doxygen_root + sep + 'build'
+        _done, _jobs, _digests = self._cache.get('jobs', {}), {}, {}
         for _lang in self.meta.get('doc_languages'):
-            _f_out = _build_folder + sep + _lang
             for _ver in self.meta.get('doc_versions'):
-                subprocess.run(["doxygen", 'Doxyfile.in'], cwd=Path(_f_out + sep + f'v{_ver}'))
-                print(f"Doxygen build system: Documentation of [{_lang}, v{_ver}] successfully generated")
+                _key, _cwd = f'{_lang}/v{_ver}', _build_folder + sep + _lang + sep + f'v{_ver}'
+                _digests[_key] = _digest(json.dumps(self._job_inputs.get(_key), sort_keys=True))
+                if _done.get(_key) == _digests[_key] and os.path.isdir(_cwd + sep + 'build_sub'):
+                    print(f"Doxygen build system: Documentation of [{_lang}, v{_ver}] is up to date")
+                    continue
+                _jobs[f'[{_lang}, v{_ver}]'] = (_key, ["doxygen", 'Doxyfile.in'], _cwd, _cwd + sep + 'doxygen.log')
+
+        failures = _run_jobs({k: v[1:] for k, v in _jobs.items()}, self.meta.get('doc_jobs'), 'Doxygen build system')
+        for k, v in _jobs.items():
+            if k in failures:
+                _done.pop(v[0], None)
+            else:
+                _done[v[0]] = _digests[v[0]]
+        self._cache['jobs'] = {k: v for k, v in _done.items() if k in _digests}
+        if failures:
+            self._dump_cache()
+            raise RuntimeError('Doxygen build system: failed jobs\n' + '\n'.join(failures.values()))
+
+    def _write_if_changed(self, path: str, content: str) -> str:
+        # skip writing if the cached hash of path is still valid, keep its timestamp; return the hash
+        _key, _hash = Path(os.path.relpath(path, self._doxygen_root)).as_posix(), _digest(content)
+        if self._cache['files'].get(_key) != _hash or not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            self._cache['files'][_key] = _hash
+        return _hash
+
+    def _load_cache(self):
+        _f = self._doxygen_root + sep + 'build' + sep + _docs_cache
+        try:
+            with open(_f, 'r', encoding='utf-8') as f:
+                self._cache = json.load(f)
+        except (OSError, ValueError):  # no or broken cache, build everything
+            self._cache = {}
+        self._cache.setdefault('files', {})
+        self._job_inputs = {}
+
+    def _dump_cache(self):
+        self._cache['files'] = {k: v for k, v in self._cache['files'].items()
+                                if os.path.exists(self._doxygen_root + sep + k)}
+        with open(self._doxygen_root + sep + 'build' + sep + _docs_cache, 'w', encoding='utf-8') as f:
+            json.dump(self._cache, f, indent=2, sort_keys=True)
 
     def _doxygen_export_navigation(self):
         _tmp = _generate_docs_index(self.meta.get('doc_languages'), self.meta.get('doc_versions'),
                                     self.meta.get('name'))
-        with open(self._doxygen_root + sep + 'build' + sep + 'docs.html', 'w', encoding='utf-8') as f:
-            f.write(_tmp)
+        self._write_if_changed(self._doxygen_root + sep + 'build' + sep + 'docs.html', _tmp)
 
     def _doxygen_build_clean(self):
-        _clean_doxygen_build(self._doxygen_root + sep + 'build')
+        # remove folders of languages and versions no longer documented, others are kept for incremental builds
+        _build_folder = self._doxygen_root + sep + 'build'
+        _langs, _vers = self.meta.get('doc_languages'), {f'v{_}' for _ in self.meta.get('doc_versions')}
+        for _lang in os.listdir(_build_folder):
+            if not os.path.isdir(_f := _build_folder + sep + _lang) or _lang.startswith('.'):
+                continue  # save isolated files for sub-git
+            if _lang not in _langs:
+                shutil.rmtree(_f)
+                continue
+            for _ver in os.listdir(_f):
+                if os.path.isdir(_v := _f + sep + _ver) and _ver.startswith('v') and _ver not in _vers:
+                    shutil.rmtree(_v)
 
     @staticmethod
     def _call_syntax_suggestion():
@@ -0,0 +1,57 @@
+import os
+sep = os.path.sep
+_cache = {}  # root: ({directory: mtime_ns}, {suffix: {relative stem: file}})
+
+
+def _mtime(x: str):
+    try:
+        return os.stat(x).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_fresh(dirs: dict) -> bool:
+    return all(_mtime(k) == v for k, v in dirs.items())
+
+
+def _walk(root: str) -> tuple[dict, dict]:
+    dirs, index = {root: _mtime(root)}, {}
+    for _dir, _subs, _files in os.walk(root):
+        _subs.sort()
+        dirs.update({_dir + sep + _: _mtime(_dir + sep + _) for _ in _subs})
+        _rel = os.path.relpath(_dir, root)
+        for _f in sorted(_files):
+            _stem, _, _suffix = _f.rpartition('.')
+            if _stem:
+                index.setdefault(_suffix, {})[_stem if _rel == '.' else _rel + sep + _stem] = _dir + sep + _f
+    return dirs, index
+
+
+def file_index(root: str) -> dict[str, dict[str, str]]:
+    """
+    files under root grouped by suffix, then by path relative to root without the suffix (e.g. 'hpp': {'net': ...});
+    one walk per root, reused until the mtime of any walked directory changes; shared, do not modify it
+    """
+    root = os.path.abspath(root)
+    _cached = _cache.get(root)
+    if _cached is None or not _is_fresh(_cached[0]):
+        _cached = _cache[root] = _walk(root)
+    return _cached[1]
+
+
+def collect_files(roots: list[str], suffixes: list[str]) -> list[tuple[str, str]]:
+    # (folder, file name) of every file with one of the suffixes, per root then per suffix
+    res = []
+    for _root in roots:
+        _index = file_index(_root)
+        for _suffix in suffixes:
+            res.extend([os.path.split(_) for _ in _index.get(_suffix, {}).values()])
+    return res
+
+
+def invalidate(root: str = None):
+    # for writers on file systems with coarse mtimes
+    if root is None:
+        _cache.clear()
+    else:
+        _cache.pop(os.path.abspath(root), None)
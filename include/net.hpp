@@ -2,6 +2,9 @@
 #pragma once
 #include <dlib/dnn.h>
 #include <dlib/matrix.h>
+#include <cstddef>
+#include <string>
+#include <vector>
 // Conan::ImportEnd
 
 
@@ -18,3 +21,72 @@ void train_with_random_data();
 
 
 int predict_random_sample();
+
+
+
+/**
+ * @brief random 28x28 images and labels in one contiguous buffer, filled in blocks
+ * @exporter
+ */
+class random_dataset {
+public:
+    static constexpr long rows = 28;
+    static constexpr long cols = 28;
+    static constexpr std::size_t pixels = rows * cols;
+
+    random_dataset(std::size_t n, unsigned long seed = 0);
+    std::size_t size() const;
+
+    /**
+     * @brief non-owning view of the i-th image
+     */
+    auto image(std::size_t i) const { return dlib::mat(buffer.data() + i * pixels, rows, cols); }
+    unsigned long label(std::size_t i) const;
+    const std::vector<unsigned long>& labels() const;
+
+    /**
+     * @brief copy samples [first, first + images.size()) into preallocated matrices, no allocation
+     * @return number of samples copied, less than images.size() at the end of the dataset
+     */
+    std::size_t copy_batch(std::size_t first, std::vector<dlib::matrix<unsigned char>>& images,
+                           std::vector<unsigned long>& batch_labels) const;
+
+    /**
+     * @brief stream mini-batches of trainer.get_mini_batch_size() samples into trainer.train_one_step
+     * @param epochs passes over the dataset
+     */
+    void train(dlib::dnn_trainer<minimal_net>& trainer, std::size_t epochs) const;
+
+private:
+    std::vector<unsigned char> buffer;
+    std::vector<unsigned long> targets;
+};
+
+
+
+/**
+ * @brief model trained with random data, cached as a file keyed on the network definition and seed
+ * @param seed seed of the random data, 0 for the default one
+ * @return path of the cached model (in FCPP_MODEL_CACHE, or fcpp_models of the temp directory), trained if missing
+ */
+std::string random_model_path(unsigned long seed = 0);
+
+
+
+/**
+ * @brief random samples to predict, drawn from a stream of their own, so they are not the training data of seed
+ * @param n number of samples
+ * @param seed seed of the cached model, see random_model_path
+ * @return samples with random labels
+ */
+random_dataset random_samples(std::size_t n, unsigned long seed = 0);
+
+
+
+/**
+ * @brief predict many random samples with one model load
+ * @param n number of samples
+ * @param seed seed of the cached model, see random_model_path and random_samples
+ * @return predicted labels of samples
+ */
+std::vector<unsigned long> predict_random_samples(std::size_t n, unsigned long seed = 0);
\ No newline at end of file
@@ -0,0 +1,120 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+
+# schema of metadata.json, key: (types, required)
+_schema = {
+    'name': (str, True),
+    'version': (str, True),
+    'target': (str, False),
+    'team': (str, False),
+    'license': (str, False),
+    'description': (str, False),
+    'authors': (list, False),
+    'maintainers': (list, False),
+    'topics': (list, False),
+    'url': (str, False),
+    'homepage': (str, False),
+    'cmake_version': (str, True),
+    'build_cppstd': (str, True),
+    'build_cstd': (str, False),
+    'is_shared': (bool, False),
+    'generate_modules_inplace': (bool, False),
+    'std_modules': (list, False),
+    'user_modules': (list, False),
+    'modules_workers': (int, False),
+    'dependencies': (dict, True),
+    'graphviz_bin': (str, False),
+    'doc_jobs': (int, False),
+    'doc_debug_intermediates': (bool, False),
+    'doc_languages': (list, False),
+    'doc_versions': (list, False),
+    'doc_doxygen_folders': (list, False),
+    'doc_doxygen_suffix': (list, False),
+    'trigger_tests': (bool, False),
+    'test_jobs': (int, False),
+    'stress_benchmark': (bool, False),
+    'stress_repetitions': (int, False),
+    'stress_warmup': (int, False),
+    'stress_threshold': ((int, float), False),
+    'saving_tests_log': (bool, False),
+    'activate_code_coverage': (bool, False),
+    'coverage_html': (bool, False),
+    'coverage_diff_base': (str, False),
+}
+_dependency_groups = ['common', 'c', 'cpp', 'test']
+_string_lists = ['std_modules', 'user_modules']  # names, item by item
+_cache = {}  # path: (mtime_ns, size, sha256, metadata)
+
+
+def _type_name(x) -> str:
+    return ' or '.join(_.__name__ for _ in x) if isinstance(x, tuple) else x.__name__
+
+
+def _validate(x: dict, path: str) -> dict:
+    errors = []
+    if not isinstance(x, dict):
+        raise ValueError(f'{path}: metadata must be a json object')
+    for k, (_type, _required) in _schema.items():
+        if k not in x:
+            if _required:
+                errors.append(f"missing key '{k}'")
+        elif not isinstance(x[k], _type) or (_type is not bool and isinstance(x[k], bool)):
+            errors.append(f"'{k}' should be {_type_name(_type)}, not {type(x[k]).__name__}")
+
+    for k in _string_lists:
+        if isinstance(x.get(k), list) and not all(isinstance(_, str) for _ in x[k]):
+            errors.append(f"'{k}' should be a list of names")
+
+    if isinstance(_deps := x.get('dependencies'), dict):
+        for _group in _dependency_groups:
+            if not isinstance(_tmp := _deps.get(_group), dict):
+                errors.append(f"'dependencies.{_group}' should be an object of package: [targets]")
+                continue
+            for k, v in _tmp.items():
+                if not isinstance(v, list) or not all(isinstance(_, str) for _ in v):
+                    errors.append(f"'dependencies.{_group}.{k}' should be a list of targets")
+
+    if errors:
+        raise ValueError(f'{path}: invalid metadata\n' + '\n'.join(errors))
+    return x
+
+
+def load_metadata(path: str) -> dict:
+    """
+    parse and validate metadata.json once, reused while the file keeps its mtime (or at least its contents);
+    the returned object is shared by all callers, do not modify it
+    """
+    path = os.path.abspath(path)
+    _stat = os.stat(path)
+    _cached = _cache.get(path)
+    if _cached is not None and _cached[:2] == (_stat.st_mtime_ns, _stat.st_size):
+        return _cached[3]
+
+    _raw = Path(path).read_bytes()
+    _hash = hashlib.sha256(_raw).hexdigest()
+    if _cached is not None and _cached[2] == _hash:  # touched only
+        _meta = _cached[3]
+    else:
+        _meta = _validate(json.loads(_raw.decode('utf-8')), path)
+    _cache[path] = (_stat.st_mtime_ns, _stat.st_size, _hash, _meta)
+    return _meta
+
+
+def merge_links(*x: dict[str, list[str]]) -> dict[str, list[str]]:
+    # {package: [targets]} tables merged in order, packages and targets keep their first position
+    res = {}
+    for _table in x:
+        for k, v in _table.items():
+            res[k] = list(dict.fromkeys(res.get(k, []) + v))
+    return res
+
+
+def dependency_links(meta: dict) -> dict[str, dict[str, list[str]]]:
+    """
+    ordered link table of metadata dependencies, {'c': {package: [targets]}, 'cpp': {...}, 'test': {...}}, where common
+    packages come first in both c and cpp
+    """
+    _common, _c, _cpp, _test = [meta.get('dependencies').get(_) for _ in _dependency_groups]
+    return {'c': merge_links(_common, _c), 'cpp': merge_links(_common, _cpp), 'test': merge_links(_test)}
@@ -1,43 +1,134 @@
 // Conan::ImportStart
 #include "net.hpp"
 #include <dlib/rand.h>
+#include <algorithm>
+#include <cstdint>
+#include <cstdlib>
+#include <cstring>
+#include <filesystem>
 #include <iostream>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <random>
+#include <system_error>
+#include <typeinfo>
 #include <vector>
+#ifdef _WIN32
+#include <process.h>
+#else
+#include <unistd.h>
+#endif
 // Conan::ImportEnd
 
 
 
 
-dlib::matrix<unsigned char> generate_random_image(dlib::rand& rnd) {
-    dlib::matrix<unsigned char> img(28, 28);
-    for (long r = 0; r < img.nr(); ++r) {
-        for (long c = 0; c < img.nc(); ++c) {
-            img(r, c) = static_cast<unsigned char>(rnd.get_random_8bit_number());
-        }
+dlib::rand seeded_rand(unsigned long seed) {
+    dlib::rand rnd;  // seed 0 keeps the default sequence
+    if (seed != 0) {
+        rnd.set_seed(std::to_string(seed));
     }
-    return img;
+    return rnd;
 }
 
 
 
-void train_with_random_data() {
-    dlib::rand rnd;
-    std::vector<dlib::matrix<unsigned char>> images;
-    std::vector<unsigned long> labels;
+random_dataset::random_dataset(std::size_t n, unsigned long seed) : buffer(n * pixels), targets(n) {
+    dlib::rand rnd = seeded_rand(seed);
+    // 8 pixels per draw, straight into the shared buffer
+    std::size_t i = 0;
+    for (; i + 8 <= buffer.size(); i += 8) {
+        const auto block = rnd.get_random_64bit_number();
+        std::memcpy(buffer.data() + i, &block, 8);
+    }
+    for (; i < buffer.size(); ++i) {
+        buffer[i] = static_cast<unsigned char>(rnd.get_random_8bit_number());
+    }
+    for (unsigned long& label : targets) {
+        label = rnd.get_integer_in_range(0, 10);
+    }
+}
+
+
+
+std::size_t random_dataset::size() const {
+    return targets.size();
+}
+
+
+
+unsigned long random_dataset::label(std::size_t i) const {
+    return targets[i];
+}
+
+
 
-    for (int i = 0; i < 1000; ++i) {
-        images.push_back(generate_random_image(rnd));  // random images
-        labels.push_back(rnd.get_integer_in_range(0, 10)); // random labels
+const std::vector<unsigned long>& random_dataset::labels() const {
+    return targets;
+}
+
+
+
+std::size_t random_dataset::copy_batch(std::size_t first, std::vector<dlib::matrix<unsigned char>>& images,
+                                       std::vector<unsigned long>& batch_labels) const {
+    const std::size_t count = first < size() ? std::min(images.size(), size() - first) : 0;
+    batch_labels.resize(images.size());
+    for (std::size_t k = 0; k < count; ++k) {
+        if (images[k].nr() != rows || images[k].nc() != cols) {
+            images[k].set_size(rows, cols);  // first use only
+        }
+        std::memcpy(&images[k](0, 0), buffer.data() + (first + k) * pixels, pixels);
+        batch_labels[k] = targets[first + k];
+    }
+    return count;
+}
+
+
+
+void random_dataset::train(dlib::dnn_trainer<minimal_net>& trainer, std::size_t epochs) const {
+    // train_one_step converts the batch to tensors before returning, so the same matrices are refilled each step
+    std::vector<dlib::matrix<unsigned char>> images(trainer.get_mini_batch_size(),
+                                                    dlib::matrix<unsigned char>(rows, cols));
+    std::vector<unsigned long> batch_labels(images.size());
+    for (std::size_t epoch = 0; epoch < epochs; ++epoch) {
+        for (std::size_t first = 0, count = 0; first < size(); first += count) {
+            count = copy_batch(first, images, batch_labels);
+            trainer.train_one_step(images.begin(), images.begin() + count, batch_labels.begin());
+        }
     }
+    trainer.get_net();  // wait for the last steps
+}
+
+
+
+unsigned long current_process_id() {
+#ifdef _WIN32
+    return static_cast<unsigned long>(_getpid());
+#else
+    return static_cast<unsigned long>(getpid());
+#endif
+}
 
+
+
+minimal_net train_random_model(unsigned long seed) {
+    random_dataset data(1000, seed);
     minimal_net net;
     dlib::dnn_trainer<minimal_net> trainer(net);
 
     trainer.set_learning_rate(0.01);
     trainer.set_mini_batch_size(32);
-    trainer.set_max_num_epochs(2);
 
-    trainer.train(images, labels);
+    data.train(trainer, 2);
+    net.clean();
+    return net;
+}
+
+
+
+void train_with_random_data() {
+    minimal_net net = train_random_model(0);
 
     dlib::serialize("random_model.dat") << net;
     std::cout << "training done，model has been saved as random_model.dat" << std::endl;
@@ -45,12 +136,89 @@ void train_with_random_data() {
 
 
 
-int predict_random_sample() {
-    minimal_net net;
-    dlib::deserialize("random_model.dat") >> net;
+std::string random_model_path(unsigned long seed) {
+    // FNV-1a of the network type and training setup, stable between runs of one build
+    const std::string definition = std::string(typeid(minimal_net).name()) + "|1000x28x28|blocks|lr0.01|mb32|ep2|" +
+                                   std::to_string(seed);
+    std::uint64_t key = 14695981039346656037ull;
+    for (unsigned char c : definition) {
+        key = (key ^ c) * 1099511628211ull;
+    }
+
+    const char* env = std::getenv("FCPP_MODEL_CACHE");
+    const std::filesystem::path folder = env != nullptr && *env != '\0' ?
+                                         std::filesystem::path(env) :
+                                         std::filesystem::temp_directory_path() / "fcpp_models";
+    const std::filesystem::path model = folder / ("random_model_" + std::to_string(key) + ".dat");
+
+    static std::mutex mtx;
+    std::lock_guard<std::mutex> lock(mtx);
+    if (!std::filesystem::exists(model)) {
+        // concurrent processes (ctest -j) may train the same model, each one writes its own temp file and the
+        // rename publishes a complete model, whichever comes first
+        std::filesystem::create_directories(folder);
+        const std::filesystem::path tmp = model.string() + "." + std::to_string(current_process_id()) + "." +
+                                          std::to_string(std::random_device{}()) + ".tmp";
+        minimal_net net = train_random_model(seed);
+        dlib::serialize(tmp.string()) << net;
+        std::error_code ec;
+        std::filesystem::rename(tmp, model, ec);
+        if (ec) {
+            std::filesystem::remove(tmp);
+            if (!std::filesystem::exists(model)) {
+                throw std::filesystem::filesystem_error("cannot publish the model", tmp, model, ec);
+            }
+        }
+    }
+    return model.string();
+}
+
+
+
+minimal_net& cached_random_model(unsigned long seed, std::unique_lock<std::mutex>& lock) {
+    // models are loaded once per process, the lock guards the (stateful) forward pass of the returned net
+    static std::mutex mtx;
+    static std::map<unsigned long, std::unique_ptr<minimal_net>> models;
+    lock = std::unique_lock<std::mutex>(mtx);
+    std::unique_ptr<minimal_net>& net = models[seed];
+    if (!net) {
+        net = std::make_unique<minimal_net>();
+        dlib::deserialize(random_model_path(seed)) >> *net;
+    }
+    return *net;
+}
+
+
+
+random_dataset random_samples(std::size_t n, unsigned long seed) {
+    // the training data of a model is random_dataset(1000, seed), prediction inputs use another seed
+    constexpr unsigned long prediction_stream = 0x9e3779b9ul;
+    return random_dataset(n, seed ^ prediction_stream);
+}
+
 
-    dlib::rand rnd;
-    dlib::matrix<unsigned char> test_img = generate_random_image(rnd);
 
-    return net(test_img);
-}
\ No newline at end of file
+std::vector<unsigned long> predict_random_samples(std::size_t n, unsigned long seed) {
+    random_dataset data = random_samples(n, seed);
+    std::vector<dlib::matrix<unsigned char>> images(std::min<std::size_t>(n, 256),
+                                                    dlib::matrix<unsigned char>(random_dataset::rows,
+                                                                                random_dataset::cols));
+    std::vector<unsigned long> labels;
+    std::vector<unsigned long> predictions;
+    predictions.reserve(n);
+
+    std::unique_lock<std::mutex> lock;
+    minimal_net& net = cached_random_model(seed, lock);
+    for (std::size_t first = 0, count = 0; first < n; first += count) {
+        count = data.copy_batch(first, images, labels);
+        const std::vector<unsigned long> batch = net(images.begin(), images.begin() + count);
+        predictions.insert(predictions.end(), batch.begin(), batch.end());
+    }
+    return predictions;
+}
+
+
+
+int predict_random_sample() {
+    return static_cast<int>(predict_random_samples(1)[0]);
+}
@@ -1,14 +1,28 @@
 from conan import ConanFile
 from conan.tools.cmake import CMake, cmake_layout, CMakeToolchain
 from conan.tools.build import can_run
-from conan.tools.env import VirtualRunEnv, VirtualBuildEnv
+from conan.tools.env import VirtualRunEnv, VirtualBuildEnv, Environment
 from pathlib import Path
+from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import statistics
+import base64
+import math
+import time
+import json
+import re
 import shutil
 import yaml
+import sys
 import os
 sep = os.path.sep
-_get_file_name = (lambda x: x.split(sep)[-1])
+_hit_hunk = re.compile(r'^@@ -\S+ \+(\d+(?:,\d+)?) @@')
+_coverage_history = 20  # builds kept in the coverage index
+sys.path.insert(0, sep.join(__file__.split(sep)[:-2]))
+sys.path.insert(0, sep.join(__file__.split(sep)[:-2] + ['benchmarks']))
+from metadata_loader import load_metadata, dependency_links, merge_links
+from baseline import median_regressions
 
 
 def _clear_test_build():
@@ -20,14 +34,143 @@ def _clear_test_build():
         os.remove(_presets)
 
 
-def _recursive_find(root: str, obj_files: list[str]):
-    for f in os.listdir(root):
-        _f = root + sep + f
-        if not os.path.isdir(_f):
-            if f in obj_files:
-                yield _f
+def _test_shard() -> tuple[int, int]:
+    # (index, total) of this runner from TEST_SHARD_INDEX / TEST_TOTAL_SHARDS, (0, 1) runs every test
+    _total = int(os.environ.get('TEST_TOTAL_SHARDS') or 1)
+    _index = int(os.environ.get('TEST_SHARD_INDEX') or 0)
+    if _total < 1 or not 0 <= _index < _total:
+        raise ValueError(f'Invalid test shard {_index}/{_total}')
+    return _index, _total
+
+
+def _junit_summary(junit: str, jobs: int, shard: tuple[int, int]) -> dict:
+    # per-test status and duration of a ctest junit report, slowest first
+    _suite = ElementTree.parse(junit).getroot()
+    _tests = []
+    for _case in _suite.iter('testcase'):
+        _status = 'fail' if _case.find('failure') is not None else _case.get('status', 'run')
+        _tests.append({'name': _case.get('name'), 'status': _status, 'seconds': float(_case.get('time') or 0)})
+    _tests.sort(key=lambda x: x['seconds'], reverse=True)
+    return {'jobs': jobs, 'shard': list(shard), 'tests': len(_tests),
+            'failures': sum([_['status'] == 'fail' for _ in _tests]),
+            'seconds': round(sum([_['seconds'] for _ in _tests]), 6), 'cases': _tests}
+
+
+def _gcov_lines(gcda: str) -> dict[str, dict[int, int]]:
+    # line counters of one object from gcov json intermediate format, counters stay where the build left them
+    _tmp = subprocess.run(['gcov', '--json-format', '--stdout', '--object-directory', os.path.dirname(gcda), gcda],
+                          cwd=os.path.dirname(gcda), capture_output=True, text=True, check=True)
+    res = {}
+    for _doc in [json.loads(_) for _ in _tmp.stdout.splitlines() if _.strip()]:
+        for _f in _doc.get('files', []):
+            _lines = res.setdefault(os.path.join(_doc.get('current_working_directory', ''), _f['file']), {})
+            for _l in _f.get('lines', []):
+                _lines[_l['line_number']] = _lines.get(_l['line_number'], 0) + _l['count']
+    return res
+
+
+def _llvm_cov_lines(binary: str, profdata: str) -> dict[str, dict[int, int]]:
+    # line counters of one instrumented binary, from llvm-cov lcov export
+    _tmp = subprocess.run(['llvm-cov', 'export', '-format=lcov', f'-instr-profile={profdata}', binary],
+                          capture_output=True, text=True, check=True)
+    res, _lines = {}, None
+    for _l in _tmp.stdout.splitlines():
+        if _l.startswith('SF:'):
+            _lines = res.setdefault(_l[3:], {})
+        elif _l.startswith('DA:') and _lines is not None:
+            _n, _c = _l[3:].split(',')[:2]
+            _lines[int(_n)] = _lines.get(int(_n), 0) + int(_c)
+    return res
+
+
+def _merge_lines(parts: list[dict[str, dict[int, int]]], root: str) -> dict[str, dict[int, int]]:
+    # counters of all objects summed per source line, only sources under root (the package build)
+    res, root = {}, os.path.normpath(root) + sep
+    for _part in parts:
+        for k, v in _part.items():
+            if not (k := os.path.normpath(k)).startswith(root):
+                continue
+            _lines = res.setdefault(k, {})
+            for _n, _c in v.items():
+                _lines[_n] = _lines.get(_n, 0) + _c
+    return dict(sorted(res.items()))
+
+
+def _write_coverage(lines: dict[str, dict[int, int]], root: str, folder: str, html: bool):
+    # merged lcov tracefile, compact json summary (paths relative to the package build) and optional html
+    os.makedirs(folder, exist_ok=True)
+    _info, _files = [], {}
+    for k, v in lines.items():
+        _covered = sum([_ > 0 for _ in v.values()])
+        _info.append('\n'.join([f'SF:{k}'] + [f'DA:{_n},{_c}' for _n, _c in sorted(v.items())] +
+                               [f'LH:{_covered}', f'LF:{len(v)}', 'end_of_record']))
+        _files[os.path.relpath(k, root).replace(sep, '/')] = {'lines': len(v), 'covered': _covered}
+    with open(folder + sep + 'coverage.info', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(_info) + '\n' if _info else '')
+    _total, _covered = sum([_['lines'] for _ in _files.values()]), sum([_['covered'] for _ in _files.values()])
+    _percent = round(100 * _covered / _total, 2) if _total else 0.0
+    with open(folder + sep + 'coverage.json', 'w', encoding='utf-8') as f:
+        json.dump({'lines': _total, 'covered': _covered, 'percent': _percent, 'files': _files}, f, indent=2)
+    if html and _info:
+        shutil.rmtree(folder + sep + 'coverage_report', ignore_errors=True)
+        subprocess.run(['genhtml', folder + sep + 'coverage.info', '--quiet', '--output-directory',
+                        folder + sep + 'coverage_report'], check=True)
+
+
+def _percentile(x: list[float], q: float) -> float:
+    # nearest rank
+    _sorted = sorted(x)
+    return _sorted[min(len(_sorted), max(1, math.ceil(len(_sorted) * q))) - 1]
+
+
+def _run_measured(cmd: list[str]) -> tuple[float, float, int]:
+    # wall seconds, peak rss (KiB, None without wait4) and return code of one process
+    _t = time.perf_counter()
+    _proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not hasattr(os, 'wait4'):
+        return time.perf_counter() - _t, None, _proc.wait()
+    _, _status, _usage = os.wait4(_proc.pid, 0)
+    _proc.returncode = os.waitstatus_to_exitcode(_status)
+    _rss = _usage.ru_maxrss / 1024 if sys.platform == 'darwin' else _usage.ru_maxrss  # bytes on macOS
+    return time.perf_counter() - _t, _rss, _proc.returncode
+
+
+def _gtest_cases(binary: str) -> list[str]:
+    # 'Suite.Case' names from --gtest_list_tests
+    _tmp = subprocess.run([binary, '--gtest_list_tests'], capture_output=True, text=True, check=True)
+    res, _suite = [], ''
+    for _l in _tmp.stdout.splitlines():
+        if not _l.strip():
+            continue
+        if not _l.startswith(' '):
+            _suite = _l.split('#')[0].strip()
         else:
-            yield from _recursive_find(_f, obj_files)
+            res.append(_suite + _l.split('#')[0].strip())
+    return res
+
+
+def _bitmap(x) -> str:
+    # line numbers as a bitmap (bit n for line n), little-endian bytes in base64
+    _n = sum([1 << _ for _ in set(x)])
+    return base64.b64encode(_n.to_bytes((_n.bit_length() + 7) // 8, 'little')).decode('ascii')
+
+
+def _bitmap_lines(x: str) -> set[int]:
+    _n = int.from_bytes(base64.b64decode(x), 'little')
+    return {i for i in range(_n.bit_length()) if _n >> i & 1}
+
+
+def _changed_lines(diff: str) -> dict[str, set[int]]:
+    # added or modified lines (new side) per file of a unified diff with zero context
+    res, _file = {}, None
+    for _l in diff.splitlines():
+        if _l.startswith('+++ '):
+            _file = _l[6:] if _l.startswith('+++ b/') else None
+        elif _l.startswith('@@') and _file is not None:
+            _start, _, _count = _hit_hunk.match(_l).group(1).partition(',')
+            _count = int(_count) if _count else 1
+            res.setdefault(_file, set()).update(range(int(_start), int(_start) + _count))
+    return {k: v for k, v in res.items() if v}
 
 
 def _entry_lists() -> list[str]:
@@ -50,7 +193,7 @@ class PackageTestConan(ConanFile):
         conandata_path = Path(self.recipe_folder).parent / "conandata.yml"
         self.conandata = yaml.safe_load(conandata_path.read_text())
         metadata_path = Path(self.recipe_folder).parent / "metadata.json"
-        self.metadata = yaml.safe_load(metadata_path.read_text())
+        self.metadata = load_metadata(str(metadata_path))
 
     def build_requirements(self):
         self.build_requires(f"cmake/{self.metadata.get('cmake_version')}")
@@ -77,13 +220,9 @@ class PackageTestConan(ConanFile):
         tc.generate()
 
     def _preparing_deps_links(self):
-        _common, _c, _cpp, _test = [self.metadata.get('dependencies').get(_) for _ in ['common', 'c', 'cpp', 'test']]
-        _c = {k: v if k not in _common.keys() else list(set(v).union(set(_common.get(k)))) for k, v in _c.items()}
-        _cpp = {k: v if k not in _common.keys() else list(set(v).union(set(_common.get(k)))) for k, v in _cpp.items()}
-        _test_deps = [f"{k}@{' '.join(v)}" for k, v in _test.items()]
-        _c_deps = [f"{k}@{' '.join(v)}" for k, v in {**_common, **_c}.items()]
-        _cpp_deps = [f"{k}@{' '.join(v)}" for k, v in {**_common, **_cpp}.items()]
-        return list(set(_c_deps).union(set(_cpp_deps)).union(set(_test_deps)))
+        # 'package@targets' items of all dependency groups for CMake, in metadata order
+        _links = dependency_links(self.metadata)
+        return [f"{k}@{' '.join(v)}" for k, v in merge_links(_links['c'], _links['cpp'], _links['test']).items()]
 
     def _get_targets(self):
         _targets, _name = self.metadata.get('target'), self.metadata.get('name')
@@ -119,33 +258,96 @@ class PackageTestConan(ConanFile):
 
         # test cases in test_pacakge/test/*.cpp
         if self.metadata.get('trigger_tests'):
+            target_folder = self.recipe_folder + sep + 'test' + sep + 'export'
+            _junit = self.build_folder + sep + 'Testing' + sep + 'TestResult.xml'
+            if os.path.exists(_junit):
+                os.remove(_junit)
             try:
                 if can_run(self):
-                    cmake = CMake(self)
-                    cmake.test()
+                    self._run_ctest(_junit)
             except (Exception, ) as err:
                 print('CTest Crashed:', err)
             finally:
-                target_folder = self.recipe_folder + sep + 'test' + sep + 'export'
-
+                _log = self.build_folder + sep + sep.join(['Testing', 'Temporary', 'LastTest.log'])
+                _results = {'TestResult.log': _log, 'TestResult.xml': _junit}
                 if self.metadata.get('saving_tests_log'):
-                    obj_folder = self.recipe_folder + sep + 'build'
-                    report = [_ for _ in _recursive_find(obj_folder, ['LastTest.log'])][0]  # need robust
-                    with open(report, 'r', encoding='utf-8') as f:
-                        _content = f.readlines()
                     if not os.path.exists(target_folder):
                         os.mkdir(target_folder)
-                    with open(target_folder + sep + 'TestResult.log', 'w', encoding='utf-8') as f:
-                        f.write(''.join(_content))
+                    for k, v in _results.items():
+                        if os.path.exists(v):
+                            shutil.copyfile(v, target_folder + sep + k)
+                    if os.path.exists(_junit):
+                        with open(target_folder + sep + 'TestResult.json', 'w', encoding='utf-8') as f:
+                            json.dump(_junit_summary(_junit, self._test_jobs(), _test_shard()), f, indent=2)
                 else:
-                    if os.path.exists(_f := target_folder + sep + 'TestResult.log'):
-                        os.remove(_f)
+                    for k in list(_results) + ['TestResult.json']:
+                        if os.path.exists(_f := target_folder + sep + k):
+                            os.remove(_f)
 
                 self._remove_entries()
 
+            if self.metadata.get('stress_benchmark') and can_run(self):
+                self._stress_benchmark(target_folder)
+
         if self.metadata.get('activate_code_coverage'):
             self._code_coverage_auto()
 
+    def _test_jobs(self) -> int:
+        return self.metadata.get('test_jobs') or os.cpu_count() or 1
+
+    def _run_ctest(self, junit: str):
+        # gtest cases are discovered as single ctest tests: run them in parallel, every n-th of them on a shard
+        _index, _total = _test_shard()
+        cmd = ['ctest', '--test-dir', f'"{self.build_folder}"', '-C', str(self.settings.build_type),
+               '-j', str(self._test_jobs()), '--output-on-failure', '--output-junit', f'"{junit}"']
+        if _total > 1:
+            cmd.extend(['-I', f'{_index + 1},,{_total}'])
+        if self.metadata.get('stress_benchmark'):  # timed separately, see _stress_benchmark
+            cmd.extend(['-LE', 'stress'])
+        env = Environment()
+        if self.metadata.get('activate_code_coverage'):  # one raw profile per clang instrumented process
+            shutil.rmtree(self._profile_folder(), ignore_errors=True)
+            env.define('LLVM_PROFILE_FILE', self._profile_folder() + sep + '%p-%m.profraw')
+        with env.vars(self).apply():
+            self.run(' '.join(cmd), env=["conanbuild", "conanrun"])
+
+    def _stress_benchmark(self, target_folder: str):
+        """
+        time each case of test/stress in its own process: warmup runs, then repetitions for min/median/p95 wall time
+        and peak rss; results go to StressResult.json, compared with StressBaseline.json (created when missing, or
+        replaced with STRESS_UPDATE_BASELINE=1), raise if any case regressed beyond stress_threshold
+        """
+        _binary = os.path.join(self.cpp.build.bindirs[0], 'stress_tests' + ('.exe' if os.name == 'nt' else ''))
+        _reps, _warmup = max(self.metadata.get('stress_repetitions') or 5, 1), self.metadata.get('stress_warmup') or 0
+        _cases = {}
+        with VirtualRunEnv(self).vars().apply():
+            for _case in _gtest_cases(_binary):
+                _cmd = [_binary, f'--gtest_filter={_case}']
+                for _ in range(_warmup):
+                    _run_measured(_cmd)
+                _runs = [_run_measured(_cmd) for _ in range(_reps)]
+                if any([_[2] != 0 for _ in _runs]):
+                    raise RuntimeError(f'Stress case {_case} failed')
+                _seconds, _rss = [_[0] for _ in _runs], [_[1] for _ in _runs if _[1] is not None]
+                _cases[_case] = {'seconds': _seconds, 'min': min(_seconds), 'median': statistics.median(_seconds),
+                                 'p95': _percentile(_seconds, 0.95), 'peak_rss_kib': max(_rss) if _rss else None}
+
+        results = {'repetitions': _reps, 'warmup': _warmup, 'cases': _cases}
+        os.makedirs(target_folder, exist_ok=True)
+        with open(target_folder + sep + 'StressResult.json', 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+        _baseline = target_folder + sep + 'StressBaseline.json'
+        if not os.path.exists(_baseline) or os.environ.get('STRESS_UPDATE_BASELINE') == '1':
+            shutil.copyfile(target_folder + sep + 'StressResult.json', _baseline)
+            print(f'Stress baseline saved to {_baseline}')
+            return
+        with open(_baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        _threshold = self.metadata.get('stress_threshold')
+        if regressions := median_regressions(_cases, baseline.get('cases', {}), 0.2 if _threshold is None else _threshold):
+            raise RuntimeError(f'Stress cases regressed: {", ".join(regressions)}')
+
     def _code_coverage_auto(self):
         compiler = getattr(self.settings, 'compiler').__str__()
         if compiler == 'gcc':
@@ -155,54 +357,117 @@ class PackageTestConan(ConanFile):
         else:
             raise NotImplementedError(f'Compiler {compiler} is not supported.')
 
+    def _tested_build_folder(self) -> str:
+        # build folder of the tested package, where its objects and counters are: FCPP_COVERAGE_BUILD_FOLDER, or the
+        # one recorded in the package by its coverage build
+        if _tmp := os.environ.get('FCPP_COVERAGE_BUILD_FOLDER'):
+            return _tmp
+        _dep = self.dependencies[self.tested_reference_str]
+        _record = Path(_dep.package_folder) / 'res' / 'coverage_build_folder'
+        if _record.is_file() and os.path.isdir(_tmp := _record.read_text(encoding='utf-8').strip()):
+            return _tmp
+        if _dep.folders.base_build and os.path.isdir(_dep.folders.base_build):
+            return _dep.folders.base_build
+        raise FileNotFoundError(f'No build folder of {self.tested_reference_str} for coverage, rebuild it with '
+                                f'activate_code_coverage or set FCPP_COVERAGE_BUILD_FOLDER')
+
+    def _coverage_folder(self) -> str:
+        return self.recipe_folder + sep + 'test' + sep + 'export' + sep + 'coverage'
+
+    def _project_git(self, args: list[str]) -> str:
+        _tmp = subprocess.run(['git'] + args, cwd=str(Path(self.recipe_folder).parent), capture_output=True, text=True)
+        return _tmp.stdout if _tmp.returncode == 0 else ''
+
+    def _coverage_index(self, lines: dict[str, dict[int, int]], root: str, folder: str) -> dict[str, dict[int, int]]:
+        """
+        store this run as line bitmaps in coverage/index/<commit>-<package id>.<shard>of<shards>.json, then merge the
+        runs of all shards of the same build (copied in from other runners, if any); lines covered only by other shards
+        count 1
+        """
+        _index_folder = folder + sep + 'index'
+        os.makedirs(_index_folder, exist_ok=True)
+        _commit = self._project_git(['rev-parse', '--short', 'HEAD']).strip() or 'local'
+        _build = f"{_commit}-{self.dependencies[self.tested_reference_str].pref.package_id}"
+        _shard, _shards = _test_shard()
+        _files = {os.path.relpath(k, root).replace(sep, '/'): [_bitmap(v), _bitmap([_n for _n, _c in v.items() if _c])]
+                  for k, v in lines.items()}
+        with open(_index_folder + sep + f'{_build}.{_shard}of{_shards}.json', 'w', encoding='utf-8') as f:
+            json.dump({'commit': _commit, 'build': _build, 'shard': [_shard, _shards], 'files': _files}, f)
+
+        # union of the shards
+        res = {k: dict(v) for k, v in lines.items()}
+        for _f in Path(_index_folder).glob(f'{_build}.*.json'):
+            for k, (_instrumented, _covered) in json.loads(_f.read_text(encoding='utf-8'))['files'].items():
+                _lines = res.setdefault(os.path.normpath(root + sep + k), {})
+                _covered = _bitmap_lines(_covered)
+                for _n in _bitmap_lines(_instrumented):
+                    _lines[_n] = _lines.get(_n) or (1 if _n in _covered else 0)
+
+        # keep the latest builds only
+        _builds = {}
+        for _f in Path(_index_folder).glob('*.json'):
+            _builds.setdefault(_f.name.split('.')[0], []).append(_f)
+        for _old in sorted(_builds, key=lambda x: max([_.stat().st_mtime for _ in _builds[x]]))[:-_coverage_history]:
+            for _f in _builds[_old]:
+                _f.unlink()
+        return dict(sorted(res.items()))
+
+    def _coverage_diff(self, lines: dict[str, dict[int, int]], root: str, folder: str):
+        # coverage of the lines changed since coverage_diff_base (HEAD by default: uncommitted changes)
+        _base = self.metadata.get('coverage_diff_base') or 'HEAD'
+        _changed = _changed_lines(self._project_git(['diff', '-U0', '--no-color', _base]))
+        _files, _lines = {}, {os.path.relpath(k, root).replace(sep, '/'): v for k, v in lines.items()}
+        for k, v in _changed.items():
+            if (_counters := _lines.get(k)) is None:
+                continue
+            _instrumented = sorted(v.intersection(_counters))
+            _uncovered = [_ for _ in _instrumented if not _counters[_]]
+            if _instrumented:
+                _files[k] = {'lines': len(_instrumented), 'covered': len(_instrumented) - len(_uncovered),
+                             'uncovered': _uncovered}
+        _total, _covered = sum([_['lines'] for _ in _files.values()]), sum([_['covered'] for _ in _files.values()])
+        _percent = round(100 * _covered / _total, 2) if _total else 100.0
+        with open(folder + sep + 'coverage.diff.json', 'w', encoding='utf-8') as f:
+            json.dump({'base': _base, 'lines': _total, 'covered': _covered, 'percent': _percent, 'files': _files},
+                      f, indent=2)
+        print(f'Differential coverage against {_base}: {_covered}/{_total} changed lines ({_percent}%)')
+
+    def _coverage_report(self, lines: dict[str, dict[int, int]], root: str):
+        coverage_folder = self._coverage_folder()
+        lines = self._coverage_index(lines, root, coverage_folder)
+        _write_coverage(lines, root, coverage_folder, self._coverage_html())
+        self._coverage_diff(lines, root, coverage_folder)
+
     def _code_coverage_clang(self):
-        raise NotImplementedError('Clang is under implementation')
+
+        # merge raw profiles of the test run, then export line counters of each test binary in parallel
+        _root = self._tested_build_folder()
+        _profraw = [str(_) for _ in Path(self._profile_folder()).glob('*.profraw')]
+        if not _profraw:
+            raise FileNotFoundError(f'No raw profile in {self._profile_folder()}, were tests run?')
+        _profdata = self._profile_folder() + sep + 'coverage.profdata'
+        subprocess.run(['llvm-profdata', 'merge', '-sparse', '-o', _profdata] + _profraw, check=True)
+
+        _binaries = [self.build_folder + sep + _ for _ in os.listdir(self.build_folder)
+                     if (_.startswith('ucov_') or _ == 'main') and os.path.isfile(self.build_folder + sep + _)]
+        with ThreadPoolExecutor(max_workers=self._test_jobs()) as pool:
+            _parts = list(pool.map(lambda x: _llvm_cov_lines(x, _profdata), _binaries))
+        self._coverage_report(_merge_lines(_parts, _root), _root)
 
     def _code_coverage_gcc(self):
 
-        # get conan build folder
-        _name, _ver = [self.metadata.get(_) for _ in ['name', 'version']]
-        _tmp = subprocess.run(["conan", "list", f"{_name}/{_ver}:*"], capture_output=True, text=True)
-        _tmp_ref = [str(_).strip() for _ in _tmp.stdout.split('\n')]
-        _pkg_uid = _tmp_ref[[i for i, _ in enumerate(_tmp_ref) if _ == 'packages'][0] + 1]
-        _tmp = subprocess.run(["conan", "cache", "path", f"{_name}/{_ver}:{_pkg_uid}"],
-                              capture_output=True, text=True)
-        _main_pkg_build_fd = sep.join(_tmp.stdout.split(sep)[:-1] + ['b', 'build'])
-
-        # collect code coverage files to export/coverage/
-        _gcda = [str(_) for _ in list(Path(_main_pkg_build_fd).rglob('*.gcda'))]
-        _gcno = [_[:-4] + 'gcno' for _ in _gcda]
-
-        target_folder = self.recipe_folder + sep + 'test' + sep + 'export'
-        coverage_folder = target_folder + sep + 'coverage'
-        if not os.path.exists(target_folder):
-            os.mkdir(target_folder)
-        else:
-            if os.path.exists(coverage_folder):
-                shutil.rmtree(coverage_folder)
-        os.mkdir(coverage_folder)
-
-        for v1, v2 in zip(_gcda, _gcno):
-            shutil.copy2(v1, coverage_folder + sep + _get_file_name(v1))
-            shutil.copy2(v2, coverage_folder + sep + _get_file_name(v2))
-
-        # auto html report generation
-        cmd1 = ['lcov', '--directory', coverage_folder, '--capture', '--output-file',
-                os.path.join(coverage_folder, 'coverage_test.info'), '--rc', 'geninfo_auto_base=1']
-        subprocess.run(cmd1, check=True)
-        cmd2 = ['lcov', '--extract', os.path.join(coverage_folder, 'coverage_test.info'),
-                f'*/.conan2/p/b/{_name[:3]}*', '--output-file',
-                os.path.join(coverage_folder, 'coverage_test.filtered.info')]
-        subprocess.run(cmd2, check=True) # hard-coding: your package name len >= 3
-        cmd3 = ['genhtml', os.path.join(coverage_folder, 'coverage_test.filtered.info'),
-                '--output-directory', os.path.join(coverage_folder, 'coverage_report')]
-        subprocess.run(cmd3, check=True)
-
-        # remove intermediate files
-        for _f in os.listdir(coverage_folder):
-            _full_name = coverage_folder + sep + _f
-            if not os.path.isdir(_full_name):
-                os.remove(_full_name)
+        # counters are read in place from the package build, one gcov process per object
+        _root = self._tested_build_folder()
+        _gcda = [str(_) for _ in Path(_root).rglob('*.gcda')]
+        with ThreadPoolExecutor(max_workers=self._test_jobs()) as pool:
+            _parts = list(pool.map(_gcov_lines, _gcda))
+        self._coverage_report(_merge_lines(_parts, _root), _root)
+
+    def _coverage_html(self) -> bool:
+        return self.metadata.get('coverage_html', True) and shutil.which('genhtml') is not None
+
+    def _profile_folder(self) -> str:
+        return self.build_folder + sep + 'profiles'
 
     def _add_entries(self):
         if self.metadata.get('trigger_tests'):
@@ -18,6 +18,13 @@ void net_predict() {
 
 
 
+void net_predict_batch() {
+    std::vector<unsigned long> predictions = predict_random_samples(256);
+    EXPECT_EQ(predictions.size(), 256u);
+}
+
+
+
 TEST(Stress, Sleep) {
     EXPECT_EQ(sleep(3), 4);
 }
@@ -26,4 +33,44 @@ TEST(Stress, Sleep) {
 
 TEST(Stress, Network) {
     EXPECT_NO_THROW(net_predict());
+}
+
+
+
+TEST(Stress, NetworkBatch) {
+    EXPECT_NO_THROW(net_predict_batch());
+}
+
+
+
+TEST(Stress, PredictionSamples) {
+    // prediction inputs are not the training data of the same seed
+    random_dataset training(1000, 0);
+    random_dataset samples = random_samples(16, 0);
+    std::size_t same = 0;
+    for (std::size_t i = 0; i < samples.size(); ++i) {
+        same += samples.image(i) == training.image(i);
+    }
+    EXPECT_EQ(same, 0u);
+}
+
+
+
+TEST(Stress, RandomDataset) {
+    // ~8 MB, odd sized so the last mini-batch is partial
+    random_dataset data(10001, 1);
+    EXPECT_EQ(data.size(), 10001u);
+    EXPECT_EQ(data.image(data.size() - 1).nr(), random_dataset::rows);
+    EXPECT_LT(data.label(0), 10u);
+
+    std::vector<dlib::matrix<unsigned char>> images(256);
+    std::vector<unsigned long> labels;
+    std::size_t total = 0, batches = 0;
+    for (std::size_t first = 0, count = 0; first < data.size(); first += count, ++batches) {
+        count = data.copy_batch(first, images, labels);
+        total += count;
+    }
+    EXPECT_EQ(total, data.size());
+    EXPECT_EQ(batches, 40u);
+    EXPECT_EQ(labels[(data.size() - 1) % images.size()], data.label(data.size() - 1));
 }
\ No newline at end of file
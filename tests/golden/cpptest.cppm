@@ -0,0 +1,116 @@
+module;
+#include <iostream>
+#include <tuple>
+#include <zlib.h>
+#include <vector>
+#include <string>
+#include <Eigen/Dense>
+export module cpptest;
+
+
+/**
+ * @brief test class declaration
+ */
+export class Person {
+public:
+    Person(std::string n, int a);
+    std::string greet() const;
+    std::string name;
+    int age;
+};
+
+
+/**
+ * @brief test template func in headers
+ * @tparam T vector like
+ * @param vec iterable thing of numbers
+ * @return a numeric
+ */
+export template <typename T>
+auto test_sum(const std::vector<T>& vec) {
+    T sum = T();
+    for (const T& elem : vec) { sum += elem; }
+    return sum;
+};
+
+
+/**
+ * @brief simple RGB color template
+ * @tparam T type trait
+ */
+export template <typename T>
+class Color {
+public:
+    Color() = default;
+    Color(T r, T g, T b) : r(r), g(g), b(b) {};
+    void set(T r, T g, T b) { this->r = r; this->g = g; this->b = b; };
+    void print() const { std::cout << "RGB(" << r << ", " << g << ", " << b << ")\n"; };
+    auto components() const{ return std::make_tuple(r, g, b); };
+private:
+    T r{}, g{}, b{};
+};
+
+
+/**
+ * @brief simple RGB int color template
+ */
+export template class Color<int>;
+
+
+/**
+ * @brief test function in cpp
+ */
+export void test_hello() { std::cout << "CPP Compiler is ready!" << std::endl; };
+
+
+/**
+ * @brief test eigen in cpp
+ */
+export void test_eigen() {
+    Eigen::Matrix3d A;
+    A << 1, 2, 3,
+         4, 5, 6,
+         7, 8, 9;
+    std::cout << "matrix A:\n" << A << "; Eigen Matrix test done!" << std::endl;
+}
+
+
+/**
+ * @brief zlib requirement test in CPP compiler
+ */
+export void test_cpp_zlib() {
+    const char in[] = "Hello, zlib in CPP!";
+    unsigned char out[128] = {0};
+    unsigned char rec[128] = {0};
+    uLong len_out = sizeof(out);
+    uLong len_rec = sizeof(rec);
+    int compress_result = compress(out, &len_out, reinterpret_cast<const Bytef*>(in),
+        static_cast<uLong>(strlen(in) + 1));
+    if (compress_result != Z_OK) {
+        std::cerr << "Compression failed with error code: " << compress_result << std::endl;
+        return;
+    }
+    int uncompress_result = uncompress(rec, &len_rec, reinterpret_cast<const Bytef*>(out), len_out);
+    if (uncompress_result != Z_OK) {
+        std::cerr << "Decompression failed with error code: " << uncompress_result << std::endl;
+        return;
+    }
+    std::cout << "Original: " << in
+              << "; Decompressed: " << reinterpret_cast<char*>(rec)
+              << "; zlib in C++ test done!" << std::endl;
+}
+
+
+/**
+ * @brief test Person construction
+ * @param n name
+ * @param a age
+ */
+Person::Person(std::string n, int a) : name(std::move(n)), age(a) {};
+
+
+/**
+ * @brief test Person meth 2
+ * @return the hello message
+ */
+std::string Person::greet() const { return "Hello, I'm " + name; };
\ No newline at end of file
@@ -0,0 +1,5 @@
+module;
+#include <iostream>
+export module doctest;
+
+
@@ -0,0 +1,9 @@
+module;
+#include <dlib/matrix.h>
+#include <iostream>
+#include <vector>
+#include <dlib/dnn.h>
+#include <dlib/rand.h>
+export module net;
+
+
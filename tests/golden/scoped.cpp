@@ -0,0 +1,34 @@
+// Conan::ImportStart
+#include "scoped.hpp"
+#include <string>
+// Conan::ImportEnd
+
+
+
+namespace fcpp {
+
+
+
+/**
+ * @brief body with a single blank line
+ * @exporter
+ */
+std::string scoped_name() {
+    std::string res = "fcpp";
+
+    return res + "::scoped";
+}
+
+
+
+}  // namespace fcpp
+
+
+
+/**
+ * @brief global one after the namespace
+ * @exporter
+ */
+int scoped_global() {
+    return 1;
+}
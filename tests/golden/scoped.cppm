@@ -0,0 +1,41 @@
+module;
+export module scoped;
+import <string>;
+
+
+namespace fcpp {
+/**
+ * @brief exported inside a namespace
+ */
+export std::string scoped_name();
+}
+
+
+namespace fcpp {
+namespace detail {
+/**
+ * @brief attached inside a nested namespace
+ */
+int scoped_level();
+}
+}
+
+
+namespace fcpp {
+/**
+ * @brief body with a single blank line
+ */
+export std::string scoped_name() {
+    std::string res = "fcpp";
+
+    return res + "::scoped";
+}
+}
+
+
+/**
+ * @brief global one after the namespace
+ */
+export int scoped_global() {
+    return 1;
+}
\ No newline at end of file
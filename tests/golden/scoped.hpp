@@ -0,0 +1,40 @@
+// Conan::ImportStart
+#pragma once
+#include <string>
+// Conan::ImportEnd
+
+
+
+namespace fcpp {
+
+
+
+/**
+ * @brief exported inside a namespace
+ * @exporter
+ */
+std::string scoped_name();
+
+
+
+namespace detail {
+
+
+
+/**
+ * @brief attached inside a nested namespace
+ * @attacher
+ */
+int scoped_level();
+
+
+
+}  // namespace detail
+
+
+
+int not_exported();
+
+
+
+}  // namespace fcpp
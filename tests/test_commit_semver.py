@@ -0,0 +1,63 @@
+from importlib import util as imp_util
+from pathlib import Path
+import pytest
+
+_script = Path(__file__).parent.parent / '.github' / 'scripts' / 'commit_semver.py'
+
+
+def _load_script():
+    spec = imp_util.spec_from_file_location('golden_commit_semver', _script)
+    module = imp_util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+semver = _load_script()
+
+
+def _notes(version: str) -> str:
+    return f'## [{version}] - 2026-01-01\n\n**Features**\n- {version}\n\n'
+
+
+def test_render_new_fragment_render(tmp_path):
+    # a changelog rendered from fragments is rendered again once a new fragment comes
+    _fragments, _changelog = tmp_path / 'changelog', tmp_path / 'CHANGELOG.md'
+    _fragments.mkdir()
+    semver.write_fragment(_fragments, _changelog, '1.0.0', _notes('1.0.0'))
+    semver.render_changelog(_fragments, _changelog)
+    semver.write_fragment(_fragments, _changelog, '1.1.0', _notes('1.1.0'))
+    semver.render_changelog(_fragments, _changelog)
+    assert _changelog.read_text(encoding='utf-8') == _notes('1.1.0') + _notes('1.0.0')
+    assert not (_fragments / 'legacy.md').exists()
+
+
+def test_legacy_entries_are_kept(tmp_path):
+    _fragments, _changelog = tmp_path / 'changelog', tmp_path / 'CHANGELOG.md'
+    _fragments.mkdir()
+    _changelog.write_text(_notes('0.9.0'), encoding='utf-8')
+    semver.write_fragment(_fragments, _changelog, '1.0.0', _notes('1.0.0'))
+    semver.render_changelog(_fragments, _changelog)
+    semver.write_fragment(_fragments, _changelog, '1.1.0', _notes('1.1.0'))
+    semver.render_changelog(_fragments, _changelog)
+    assert _changelog.read_text(encoding='utf-8') == _notes('1.1.0') + _notes('1.0.0') + _notes('0.9.0')
+
+
+def test_refuse_to_drop_entries(tmp_path):
+    _fragments, _changelog = tmp_path / 'changelog', tmp_path / 'CHANGELOG.md'
+    _fragments.mkdir()
+    _changelog.write_text(_notes('0.9.0'), encoding='utf-8')
+    (_fragments / '1.0.0.md').write_text(_notes('1.0.0'), encoding='utf-8')  # no legacy snapshot
+    with pytest.raises(SystemExit):
+        semver.render_changelog(_fragments, _changelog)
+    assert _changelog.read_text(encoding='utf-8') == _notes('0.9.0')
+
+
+@pytest.mark.parametrize('make_folder', [False, True])
+def test_refuse_to_render_nothing(tmp_path, make_folder):
+    _fragments, _changelog = tmp_path / 'changelog', tmp_path / 'CHANGELOG.md'
+    if make_folder:
+        _fragments.mkdir()
+    _changelog.write_text('# Changelog\nold entry\n', encoding='utf-8')
+    with pytest.raises(SystemExit):
+        semver.render_changelog(_fragments, _changelog)
+    assert _changelog.read_text(encoding='utf-8') == '# Changelog\nold entry\n'
@@ -0,0 +1,92 @@
+from importlib import util as imp_util
+from pathlib import Path
+import hashlib
+import pytest
+import json
+import sys
+
+_root = Path(__file__).parent.parent
+_golden = Path(__file__).parent / 'golden'
+_generator_cases = [('cpptest', []), ('doctest', []), ('net', []), ('scoped', ['<string>', '"scoped.hpp"'])]
+
+
+def _load_recipe():
+    # like conan does for recipes, the recipe folder is importable
+    if str(_root) not in sys.path:
+        sys.path.insert(0, str(_root))
+    spec = imp_util.spec_from_file_location('golden_conanfile', _root / 'conanfile.py')
+    module = imp_util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+recipe = _load_recipe()
+
+
+def _generate(name: str, importable: list[str]) -> str:
+    return recipe._module_content(str(_golden / f'{name}.hpp'), str(_golden / f'{name}.cpp'), name, importable)
+
+
+def _generator_digest() -> str:
+    # outputs of every golden pair, any change of them is a change of the generated module layout
+    _h = hashlib.sha256()
+    for _name, _importable in _generator_cases:
+        _h.update(_generate(_name, _importable).encode('utf-8') + b'\0')
+    return _h.hexdigest()
+
+
+def _split_fragment(x: str) -> tuple[set[str], str]:
+    # include lines of the global module fragment, and the rest
+    _lines = x.split('\n')
+    _end = _lines.index(next(_ for _ in _lines if _.startswith('export module ')))
+    return set(_lines[1:_end]), '\n'.join(_lines[:1] + _lines[_end:])
+
+
+@pytest.mark.parametrize('name', ['cpptest', 'doctest', 'net'])
+def test_matches_previous_generator(name):
+    # goldens of the repo pairs are outputs of the previous generator, which ordered fragment includes through a set
+    _new_includes, _new_rest = _split_fragment(_generate(name, []))
+    _old_includes, _old_rest = _split_fragment((_golden / f'{name}.cppm').read_text(encoding='utf-8'))
+    assert _new_includes == _old_includes
+    assert _new_rest == _old_rest
+
+
+@pytest.mark.parametrize('name', ['cpptest', 'doctest', 'net'])
+def test_fragment_includes_are_ordered(name):
+    # hpp includes first, then the new ones of cpp, in source order
+    _lines = _generate(name, []).split('\n')
+    _includes = _lines[1:_lines.index(f'export module {name};')]
+    _sources = [_.strip() for _f in ['hpp', 'cpp'] for _ in (_golden / f'{name}.{_f}').read_text(encoding='utf-8')
+                .split('\n') if _.startswith('#include ') and f'{name}.hpp' not in _]
+    assert _includes == list(dict.fromkeys(_sources))
+
+
+def test_namespaces_and_blank_lines():
+    # objects keep the namespaces they live in and their single blank lines, imports replace valid includes
+    _expected = (_golden / 'scoped.cppm').read_text(encoding='utf-8')
+    assert _generate('scoped', ['<string>', '"scoped.hpp"']) == _expected
+
+
+def test_export_objects_in_namespace():
+    _lines = ['namespace fcpp {', '', '', '', '/**', ' * @exporter', ' */', 'int f();', '', '', '',
+              'int g();', '', '', '', '}  // namespace fcpp']
+    exporters, attachers = recipe._get_export_objects([_ + '\n' for _ in _lines])
+    assert exporters == ['namespace fcpp {\n/**\n */\nexport int f();\n}']
+    assert attachers == []
+
+
+def test_single_blank_line_does_not_cut_object():
+    _lines = ['/**', ' * @attacher', ' */', 'int f() {', '    int a = 1;', '', '    return a;', '}']
+    exporters, attachers = recipe._get_export_objects([_ + '\n' for _ in _lines])
+    assert exporters == []
+    assert attachers == ['/**\n */\nint f() {\n    int a = 1;\n\n    return a;\n}']
+
+
+def test_generator_version_follows_output():
+    # manifests of the recipe are only valid for the generator version they were written by: outputs changed
+    # without a bump of _modules_generator_version would reuse stale modules; update generator.json after the bump
+    _record = json.loads((_golden / 'generator.json').read_text(encoding='utf-8'))
+    _digest = _generator_digest()
+    assert _record['version'] == recipe._modules_generator_version, 'generator.json is not updated after the bump'
+    assert _record['digest'] == _digest, (f'generated modules changed, bump _modules_generator_version in '
+                                          f'conanfile.py and set digest {_digest} in generator.json')